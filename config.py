@@ -4,4 +4,69 @@ from dotenv import load_dotenv
 load_dotenv()
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
-DATABASE_URL = os.getenv("DATABASE_URL")
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Провайдер автоперевода: "openai" или "stub" (детерминированный, для тестов и бенчмарков)
+TRANSLATION_PROVIDER = os.getenv("TRANSLATION_PROVIDER", "openai")
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Пул соединений с MySQL: постоянные соединения, сверх них при пике,
+# пересоздание старше DB_POOL_RECYCLE сек (раньше wait_timeout сервера)
+# и сколько соединений открыть заранее при старте воркера
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_MIN = min(int(os.getenv("DB_POOL_MIN", "2")), DB_POOL_SIZE)
+
+# Реплика для чтения (GET-страницы). Если не задана — всё читается с primary.
+# При недоступности реплики или отставании больше REPLICA_MAX_LAG секунд
+# чтение переключается на primary; состояние перепроверяется раз в REPLICA_CHECK_INTERVAL.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "10"))
+
+# Продакшен-запуск (serve.py): адрес и число воркеров (по умолчанию — число CPU)
+WEB_HOST = os.getenv("WEB_HOST", "0.0.0.0")
+WEB_PORT = int(os.getenv("WEB_PORT", "8000"))
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0")) or os.cpu_count() or 1
+
+# Как часто (сек) воркер сверяет версии кешей с базой; 0 — на каждом запросе
+CACHE_VERSION_CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", "0"))
+
+# Автоназначение заявок: интервал планировщика в секундах (0 — выключено),
+# максимум заявок in_progress на модератора (0 — без ограничения)
+# и период полной пересборки индекса загрузки
+AUTO_ASSIGN_INTERVAL = float(os.getenv("AUTO_ASSIGN_INTERVAL", "0"))
+AUTO_ASSIGN_MAX_ACTIVE = int(os.getenv("AUTO_ASSIGN_MAX_ACTIVE", "0"))
+AUTO_ASSIGN_RELOAD_INTERVAL = float(os.getenv("AUTO_ASSIGN_RELOAD_INTERVAL", "60"))
+
+# Лента событий смены роли для бота: максимальное ожидание long-poll
+# и период проверки MAX(id) ленты на события других воркеров (сек) —
+# это и есть верхняя граница задержки доставки между воркерами
+STATUS_FEED_MAX_TIMEOUT = float(os.getenv("STATUS_FEED_MAX_TIMEOUT", "30"))
+STATUS_FEED_POLL_INTERVAL = float(os.getenv("STATUS_FEED_POLL_INTERVAL", "0.5"))
+
+# Профилирование запросов: доля запросов, профилируемых выборочно (0 — только
+# по запросу администратора через X-Profile: 1 или ?profile=1),
+# и сколько последних профилей хранить в памяти воркера
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+# Бюджет SQL-запросов на HTTP-запрос: "off", "warn" — предупреждение в лог,
+# "strict" — исключение (для тестов). Бюджет маршрута объявляется @query_budget,
+# иначе QUERY_BUDGET_DEFAULT; QUERY_REPEAT_LIMIT одинаковых запросов — признак N+1.
+# DEBUG=1 добавляет счётчики в заголовки ответа (X-Query-Count, X-Query-Max-Repeat)
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "warn")
+QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", "10"))
+QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", "3"))
+DEBUG = os.getenv("DEBUG", "0") == "1"
+
+# Кеш страниц чатов закрытых заявок: объём в памяти воркера (байт)
+# и каталог, куда вытесняются страницы ("" — без диска)
+CHAT_CACHE_MAX_BYTES = int(os.getenv("CHAT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CHAT_CACHE_DIR = os.getenv("CHAT_CACHE_DIR", "cache/chats")
+
+# Импорт файлов переводов (CSV/XLIFF/PO): строк в пачке и максимум
+# строк изменений/ошибок в отчёте
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+IMPORT_REPORT_LIMIT = int(os.getenv("IMPORT_REPORT_LIMIT", "200"))
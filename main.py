@@ -1,52 +1,196 @@
 # main.py
+import time
+import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request, Depends, HTTPException, Cookie, Form
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from models import SessionLocal, Translation, User, Status, Language, SupportRequest, Credentials
+from models import engine, read_engine, SessionLocal, Translation, User, SupportRequest, Credentials
 from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import selectinload
 from utils.telegram import resolve_photo_url
 from pydantic import BaseModel
-from sqlalchemy import select, update, insert, func
+from sqlalchemy import select, update, func
 from collections import defaultdict
+from typing import List
 import uvicorn
-import json
 import bcrypt
 import secrets
 import traceback
 from starlette.responses import Response
 from starlette.status import HTTP_303_SEE_OTHER
 from utils.logger import logger
+from utils.db import read_session, warm_pool, ping, replica_router
+from utils.reference import key_descriptions, flags, status_labels
+from utils.profiling import (
+    RequestProfile, profile_store, current_profile, requested, sampled,
+    instrument_engine, instrument_templates
+)
+from utils.query_budget import (
+    QueryCounter, current_counter, check_budget, track_queries, query_budget, uncounted
+)
 from routes import (
+    assignment,
     gpt_translations,
     save_translations,
-    settings
+    import_translations,
+    settings,
+    status_feed as status_feed_routes
 )
+from services.assignment import assignment_engine, run_scheduler
+from services.translation_coverage import coverage
+from services.status_feed import status_feed, publish_status, create_status_events_table
+from services.cache_versions import cache_versions
+from services.message_search import ensure_search_index, search_messages
+from services.reference_cache import reference_cache
+from services.page_cache import chat_cache
+from services.list_views import fetch_users_page, fetch_requests_page
+from contextlib import asynccontextmanager
+from config import AUTO_ASSIGN_INTERVAL, DEBUG, DB_POOL_MIN
+import asyncio
+import cProfile
 
 class UpdateRequest(BaseModel):
     key: str
     lang: str
     text: str
 
-# Загрузка описаний ключей
-with open("descriptions.json", encoding="utf-8") as f:
-    key_descriptions = json.load(f)
-
-with open("flags.json", encoding="utf-8") as f:
-    flags = json.load(f)
-
-with open("status_labels.json", encoding="utf-8") as f:
-    status_labels = json.load(f)
+# Пробы балансировщика: без проверки версий кешей, профилирования и бюджета запросов
+PROBE_PATHS = ("/healthz", "/readyz")
+
+
+def compile_templates(*template_sets) -> int:
+    """Компилирует все шаблоны заранее — первый рендер страницы не тратит время на разбор"""
+    compiled = 0
+    for t in template_sets:
+        for name in t.env.list_templates():
+            t.env.get_template(name)
+            compiled += 1
+    return compiled
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+
+    await create_status_events_table()
+    await cache_versions.prepare()
+    # Без полнотекстового индекса /search показывает, что поиск недоступен
+    app.state.search_available = await ensure_search_index()
+
+    # Прогрев: соединения пула, шаблоны, справочники и индекс покрытия
+    await warm_pool(engine, DB_POOL_MIN)
+    if read_engine is not engine and await replica_router.use_replica():
+        await warm_pool(read_engine, DB_POOL_MIN)
+    compiled = compile_templates(templates, settings.templates)
+    await cache_versions.sync(force=True)
+    await reference_cache.refresh()
+    await coverage.ensure_loaded()
+    # Страницы чатов, сохранённые с прежней версией шаблона, больше не нужны
+    pruned = chat_cache.prune()
+    logger.info(f"🔥 Прогрев: соединений {DB_POOL_MIN}, шаблонов {compiled}, удалено устаревших чатов {pruned}")
+
+    assignment_task = None
+    if AUTO_ASSIGN_INTERVAL > 0:
+        assignment_task = asyncio.create_task(
+            run_scheduler(assignment_engine, AUTO_ASSIGN_INTERVAL)
+        )
 
-app = FastAPI()
+    # Время от начала импорта main до готовности принимать запросы
+    app.state.startup_seconds = time.perf_counter() - import_started
+    logger.info(f"🚀 Приложение готово за {app.state.startup_seconds * 1000:.0f} мс")
+    app.state.ready = True
+
+    yield
+
+    # Балансировщик перестаёт направлять запросы, пока воркер завершается
+    app.state.ready = False
+    if assignment_task:
+        assignment_task.cancel()
+        # Дожидаемся остановки: планировщик закрывает соединение с блокировкой до dispose()
+        await asyncio.gather(assignment_task, return_exceptions=True)
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    logger.info("🛑 Приложение остановлено")
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(gpt_translations.router)
 app.include_router(save_translations.router)
+app.include_router(import_translations.router)
 app.include_router(settings.router)
+app.include_router(assignment.router)
+app.include_router(status_feed_routes.router)
 templates = Jinja2Templates(directory="templates")
+instrument_templates(templates)
+instrument_engine(engine)
+instrument_engine(read_engine)
+track_queries(engine)
+track_queries(read_engine)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Кеши процесса сбрасываются, когда данные меняет другой воркер
+cache_versions.subscribe("translations", coverage.invalidate)
+cache_versions.subscribe("groups", assignment_engine.invalidate)
+cache_versions.subscribe("languages", reference_cache.invalidate)
+cache_versions.subscribe("groups", reference_cache.invalidate)
+
+@app.middleware("http")
+async def cache_coherence(request: Request, call_next):
+    if not request.url.path.startswith(("/static",) + PROBE_PATHS):
+        await cache_versions.sync()
+    return await call_next(request)
+
+
+async def is_admin(user_id) -> bool:
+    if not user_id or not str(user_id).isdigit():
+        return False
+    async with SessionLocal() as session:
+        role = await session.scalar(select(User.role).where(User.id == int(user_id)))
+    return role == "admin"
+
+
+@app.middleware("http")
+async def request_profiler(request: Request, call_next):
+    path = request.url.path
+    if path.startswith(("/static", "/profiles") + PROBE_PATHS):
+        return await call_next(request)
+
+    reason = None
+    if requested(request):
+        # Проверка роли — служебный запрос профилировщика, не запрос маршрута
+        with uncounted():
+            if await is_admin(request.cookies.get("user_id")):
+                reason = "admin"
+    if reason is None and sampled():
+        reason = "sample"
+    if reason is None:
+        return await call_next(request)
+
+    profile = RequestProfile(request.method, path, reason)
+    token = current_profile.set(profile)
+    profiler = None
+    if not profile_store.cprofile_busy:
+        profile_store.cprofile_busy = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        if reason == "admin":
+            response.headers["X-Profile-Id"] = str(profile.id)
+        return response
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profile_store.cprofile_busy = False
+        current_profile.reset(token)
+        profile.finish(status_code, profiler)
+        profile_store.add(profile)
+
 
 # Этот middleware позволит перехватывать 500 ошибки
 @app.middleware("http")
@@ -96,6 +240,37 @@ async def custom_error_handler(request: Request, call_next):
             status_code=500
         )
 
+# Снаружи обработчика ошибок: в strict-режиме нарушение бюджета доходит до тестов как исключение
+@app.middleware("http")
+async def query_counter(request: Request, call_next):
+    if request.url.path.startswith(("/static",) + PROBE_PATHS):
+        return await call_next(request)
+    counter = QueryCounter()
+    token = current_counter.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        current_counter.reset(token)
+    if DEBUG:
+        response.headers["X-Query-Count"] = str(counter.count)
+        response.headers["X-Query-Max-Repeat"] = str(counter.max_repeat)
+    check_budget(counter, request.scope, request.method, request.url.path)
+    return response
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: процесс жив и обрабатывает запросы"""
+    return JSONResponse({"status": "ok"})
+
+@app.get("/readyz")
+async def readyz(request: Request):
+    """Readiness: прогрев завершён и база отвечает"""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse({"status": "starting"}, status_code=503)
+    if not await ping(engine):
+        return JSONResponse({"status": "db_unavailable"}, status_code=503)
+    return JSONResponse({"status": "ready"})
+
 @app.get("/login", response_class=HTMLResponse)
 async def login_form(request: Request):
     logger.debug("[GET /login] Отображение формы входа")
@@ -142,11 +317,12 @@ def get_current_user(user_id: str = Cookie(None)):
     return int(user_id)
 
 @app.get("/", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(4)
 async def index(request: Request):
     logger.info("[GET /] Загрузка главной страницы")
 
     try:
-        async with SessionLocal() as session:
+        async with read_session() as session:
             logger.debug("[/index] Получение статистики пользователей")
             u = await session.execute(
                 select(User.language_code, func.count()).group_by(User.language_code)
@@ -170,6 +346,8 @@ async def index(request: Request):
             )
             raw = r.all()
 
+        lang_names = (await reference_cache.get()).lang_names
+
         req_stats = {}
         for lang, st, cnt in raw:
             rec = req_stats.setdefault(lang, {
@@ -190,8 +368,6 @@ async def index(request: Request):
 
         languages = sorted(set(user_stats) | set(mod_stats) | set(req_stats))
         statuses = ["pending", "in_progress", "closed"]
-        langs_result = await session.execute(select(Language))
-        lang_names = {l.code: l.name_ru for l in langs_result.scalars().all()}
 
         return templates.TemplateResponse("index.html", {
             "request": request,
@@ -213,30 +389,31 @@ async def index(request: Request):
         raise
 
 @app.get("/translations", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(3)
 async def show_translations(request: Request):
     logger.info("[GET /translations] Загрузка страницы переводов")
 
     try:
-        async with SessionLocal() as session:
+        async with read_session() as session:
             # Загружаем все переводы
             result = await session.execute(select(Translation))
             translations_raw = result.scalars().all()
 
-            # Загружаем все языки
-            all_langs_result = await session.execute(select(Language))
-            all_langs = all_langs_result.scalars().all()
+        await coverage.ensure_loaded()
+
+        all_langs = (await reference_cache.get()).languages
 
         translations = defaultdict(dict)
-        used_lang_codes = set()
+        used_lang_codes = coverage.used_languages()
 
         for row in translations_raw:
             translations[row.key][row.lang] = row.text
-            used_lang_codes.add(row.lang)
 
         selected_code = request.query_params.get("add")
         selected_lang = next((l for l in all_langs if l.code == selected_code), None)
 
         temp_translations = {}
+        rejected_keys = []
 
         if selected_lang:
             # Показываем только ru и выбранный
@@ -244,11 +421,11 @@ async def show_translations(request: Request):
             if selected_lang.code != "ru":
                 langs.append(selected_lang)
 
-            # GPT перевод
-            from services.gpt_translate import translate_with_gpt
+            # Автоперевод (провайдер загружается при первом использовании)
+            from services.translation_providers import translate
             ru_texts = {k: v["ru"] for k, v in translations.items() if "ru" in v}
 
-            gpt_translations = await translate_with_gpt(
+            gpt_translations, rejected_keys = await translate(
                 ru_texts,
                 selected_lang.code,
                 selected_lang.name_ru,
@@ -258,6 +435,8 @@ async def show_translations(request: Request):
             for k, v in gpt_translations.items():
                 translations[k][selected_lang.code] = v
             temp_translations = gpt_translations
+            if rejected_keys:
+                logger.warning(f"[GET /translations] ⚠ Отбракованы ключи ({selected_lang.code}): {rejected_keys}")
 
         else:
             # Показываем все языки, которые уже используются
@@ -276,7 +455,9 @@ async def show_translations(request: Request):
             "missing_langs": missing_langs,
             "selected_lang": selected_lang,
             "temp_translations": temp_translations,
+            "rejected_keys": rejected_keys,
             "key_descriptions": key_descriptions,
+            "coverage": coverage.summary(),
             "flags": flags
         })
 
@@ -285,6 +466,7 @@ async def show_translations(request: Request):
         raise
 
 @app.post("/update")
+@query_budget(5)
 async def update_translation(data: UpdateRequest):
     logger.info(f"[POST /update] Запрос на обновление перевода: key='{data.key}', lang='{data.lang}'")
 
@@ -303,7 +485,9 @@ async def update_translation(data: UpdateRequest):
                 return JSONResponse(content={"status": "not_found"}, status_code=404)
 
             translation.text = data.text
+            await cache_versions.bump(session, "translations")
             await session.commit()
+            coverage.put(data.key, data.lang, data.text)
 
             logger.info(f"[POST /update] ✅ Перевод обновлён: key='{data.key}', lang='{data.lang}'")
             return JSONResponse(content={"status": "updated"})
@@ -313,52 +497,29 @@ async def update_translation(data: UpdateRequest):
         raise
 
 @app.get("/users", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(4)
 async def users_view(
     request: Request,
     q: str = "",
     role: str = "",
     page: int = 1,
-    per_page: int = 20
+    per_page: int = 20,
+    error: str = ""
 ):
-    offset = (page - 1) * per_page
     client_ip = request.client.host
     current_user = request.scope.get("user")
 
     logger.info(f"🔍 /users requested by {current_user} from {client_ip} | q='{q}', role='{role}', page={page}")
 
-    async with SessionLocal() as session:
-        count_query = select(func.count()).select_from(User)
-        user_query = select(User)
-
-        filters = []
-
-        if q:
-            like = f"%{q.lower()}%"
-            filters.append(func.lower(User.username).like(like) | func.lower(User.full_name).like(like))
-
-        if role:
-            filters.append(User.role == role)
-
-        if filters:
-            count_query = count_query.where(*filters)
-            user_query = user_query.where(*filters)
-
-        total = await session.scalar(count_query)
+    async with read_session() as session:
+        users, total = await fetch_users_page(session, q, role, page, per_page)
 
         langs = await session.execute(
             select(User.language_code, func.count()).group_by(User.language_code)
         )
         lang_counts = dict(langs.all())
 
-        users = await session.execute(
-            user_query.order_by(User.id.desc()).offset(offset).limit(per_page)
-        )
-
-        langs_available = await session.execute(
-            select(Language).where(Language.available == True)
-        )
-        available_languages = langs_available.scalars().all()
-
+    available_languages = (await reference_cache.get()).available_languages
     lang_names = {lang.code: lang.name_ru for lang in available_languages}
 
     total_pages = (total + per_page - 1) // per_page
@@ -368,16 +529,52 @@ async def users_view(
         "total": total,
         "lang_counts": lang_counts,
         "lang_names": lang_names,
-        "users": users.scalars().all(),
+        "users": users,
         "query": q,
         "selected_role": role,
         "page": page,
         "total_pages": total_pages,
         "available_languages": available_languages,
-        "flags": flags
+        "flags": flags,
+        "error": USER_ERRORS.get(error)
     })
 
+@app.get("/users/fragment", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(3)
+async def users_fragment(
+    request: Request,
+    q: str = "",
+    role: str = "",
+    page: int = 1,
+    per_page: int = 20
+):
+    """Только таблица пользователей и пагинация — для поиска без перезагрузки страницы"""
+    async with read_session() as session:
+        users, total = await fetch_users_page(session, q, role, page, per_page)
+
+    available_languages = (await reference_cache.get()).available_languages
+
+    return templates.TemplateResponse("includes/users_list.html", {
+        "request": request,
+        "lang_names": {lang.code: lang.name_ru for lang in available_languages},
+        "users": users,
+        "query": q,
+        "selected_role": role,
+        "page": page,
+        "total_pages": (total + per_page - 1) // per_page,
+        "available_languages": available_languages,
+        "flags": flags
+    }, headers={"X-Total-Count": str(total)})
+
+# Коды ошибок для редиректа на /users после неудачной записи
+USER_ERRORS = {
+    "language": "Не удалось сменить язык пользователя",
+    "role": "Не удалось сменить роль пользователя",
+    "batch": "Массовое изменение не применено: ни один пользователь не изменён",
+}
+
 @app.post("/users/set-language")
+@query_budget(3)
 async def set_user_language(request: Request, user_id: int = Form(...), lang: str = Form(...)):
     try:
         async with SessionLocal() as session:
@@ -397,10 +594,22 @@ async def set_user_language(request: Request, user_id: int = Form(...), lang: st
 
     except Exception as e:
         logger.error(f"❌ Error in set_user_language for user_id={user_id}: {e}\n{traceback.format_exc()}")
+        return RedirectResponse("/users?error=language", status_code=303)
 
     return RedirectResponse("/users", status_code=303)
 
+def generate_admin_credentials(username: str) -> tuple[str, str, str]:
+    """Возвращает (email, пароль, bcrypt-хеш) для нового администратора"""
+    username = username.lstrip("@")
+    email = f"{username}@admin.grandtime.com"
+    raw_pw = username + secrets.token_hex(3)
+    pw_hash = bcrypt.hashpw(raw_pw.encode(), bcrypt.gensalt()).decode()
+    return email, raw_pw, pw_hash
+
+# Повышение до admin: синхронизация версий, пользователь, UPDATE, учётные данные,
+# status, status_events и два запроса bump версии — 8
 @app.post("/users/set-role")
+@query_budget(8)
 async def set_user_role(request: Request, user_id: int = Form(...), role: str = Form(...)):
     try:
         async with SessionLocal() as session:
@@ -417,10 +626,7 @@ async def set_user_role(request: Request, user_id: int = Form(...), role: str =
 
             text = None
             if role == "admin":
-                username = user.username.lstrip("@")
-                email = f"{username}@admin.grandtime.com"
-                raw_pw = username + secrets.token_hex(3)
-                pw_hash = bcrypt.hashpw(raw_pw.encode(), bcrypt.gensalt()).decode()
+                email, raw_pw, pw_hash = generate_admin_credentials(user.username)
 
                 credentials_stmt = mysql_insert(Credentials).values(
                     user_id=user.id,
@@ -433,23 +639,112 @@ async def set_user_role(request: Request, user_id: int = Form(...), role: str =
                 text = f"Email: {email}\nPassword: {raw_pw}"
                 logger.info(f"✅ Admin credentials created for user_id={user_id} | email={email}")
 
-            status_stmt = insert(Status).values(
-                id=user.id,
-                language_code=user.language_code,
-                role=role,
-                text=text
-            )
-            await session.execute(status_stmt)
+            await publish_status(session, [{
+                "id": user.id,
+                "language_code": user.language_code,
+                "role": role,
+                "text": text
+            }])
 
+            await cache_versions.bump(session, "groups")
             await session.commit()
+            status_feed.notify()
+            assignment_engine.invalidate()
             logger.info(f"✅ Role '{role}' assigned to user_id={user_id} successfully")
 
     except Exception as e:
         logger.error(f"❌ Error in set_user_role for user_id={user_id}: {e}\n{traceback.format_exc()}")
+        return RedirectResponse("/users?error=role", status_code=303)
+
+    return RedirectResponse("/users", status_code=303)
+
+@app.post("/users/batch")
+@query_budget(8)
+async def batch_update_users(
+    request: Request,
+    user_ids: List[int] = Form(...),
+    role: str = Form(""),
+    lang: str = Form("")
+):
+    """Массовая смена роли и/или языка: одно UPDATE ... WHERE id IN (...), один коммит"""
+    logger.info(f"👥 Batch update for {len(user_ids)} users: role='{role}', lang='{lang}'")
+
+    if not role and not lang:
+        return RedirectResponse("/users", status_code=303)
+
+    try:
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(User.id, User.username, User.language_code).where(User.id.in_(user_ids))
+            )
+            users = result.all()
+            if not users:
+                logger.warning(f"⚠️ Batch update: no existing users among {user_ids} from {request.client.host}")
+                return RedirectResponse("/users", status_code=303)
+
+            if role == "admin":
+                skipped = [u.id for u in users if not u.username]
+                if skipped:
+                    logger.warning(f"⚠️ Batch update: users without username can't be admins: {skipped}")
+                users = [u for u in users if u.username]
+
+            ids = [u.id for u in users]
+            values = {}
+            if role:
+                values["role"] = role
+            if lang:
+                values["language_code"] = lang
+
+            await session.execute(
+                update(User).where(User.id.in_(ids)).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+            if role:
+                texts = {}
+                if role == "admin":
+                    # bcrypt — CPU-bound, считаем хеши параллельно в пуле потоков
+                    creds = await asyncio.gather(*(
+                        asyncio.to_thread(generate_admin_credentials, u.username) for u in users
+                    ))
+                    credentials_stmt = mysql_insert(Credentials).values([
+                        {"user_id": u.id, "email": email, "password_hash": pw_hash}
+                        for u, (email, _, pw_hash) in zip(users, creds)
+                    ])
+                    credentials_stmt = credentials_stmt.on_duplicate_key_update(
+                        password_hash=credentials_stmt.inserted.password_hash
+                    )
+                    await session.execute(credentials_stmt)
+                    texts = {
+                        u.id: f"Email: {email}\nPassword: {raw_pw}"
+                        for u, (email, raw_pw, _) in zip(users, creds)
+                    }
+
+                await publish_status(session, [
+                    {
+                        "id": u.id,
+                        "language_code": lang or u.language_code,
+                        "role": role,
+                        "text": texts.get(u.id)
+                    }
+                    for u in users
+                ])
+                await cache_versions.bump(session, "groups")
+
+            await session.commit()
+            if role:
+                assignment_engine.invalidate()
+                status_feed.notify()
+            logger.info(f"✅ Batch update applied to {len(ids)} users: {values}")
+
+    except Exception as e:
+        logger.error(f"❌ Error in batch_update_users for {user_ids}: {e}\n{traceback.format_exc()}")
+        return RedirectResponse("/users?error=batch", status_code=303)
 
     return RedirectResponse("/users", status_code=303)
 
 @app.get("/requests", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(4)
 async def requests_view(
     request: Request,
     lang: str = "all",
@@ -457,7 +752,6 @@ async def requests_view(
     page: int = 1,
     per_page: int = 20,
 ):
-    offset = (page - 1) * per_page
     client_ip = request.client.host
     current_user = request.scope.get("user")
 
@@ -465,30 +759,10 @@ async def requests_view(
         f"📥 /requests requested by {current_user} from {client_ip} | lang={lang} | status={status} | page={page}, per_page={per_page}"
     )
 
-    async with SessionLocal() as session:
-        # Получаем все языки
-        languages_result = await session.execute(select(Language))
-        languages = languages_result.scalars().all()
-        lang_names = {l.code: l.name_ru for l in languages}
-
-        # Запрос по SupportRequest
-        q = select(SupportRequest) \
-            .options(
-                selectinload(SupportRequest.user),
-                selectinload(SupportRequest.moderator)
-            ) \
-            .order_by(SupportRequest.created_at.desc())
-
-        if lang != "all":
-            q = q.where(SupportRequest.language == lang)
-        if status != "all":
-            q = q.where(SupportRequest.status == status)
-
-        total_q = select(func.count()).select_from(q.subquery())
-        total = await session.scalar(total_q)
+    lang_names = (await reference_cache.get()).lang_names
 
-        result = await session.execute(q.offset(offset).limit(per_page))
-        requests_list = result.scalars().all()
+    async with read_session() as session:
+        requests_list, total = await fetch_requests_page(session, lang, status, page, per_page)
 
         stat_result = await session.execute(
             select(
@@ -532,14 +806,107 @@ async def requests_view(
         "per_page": per_page,
     })
 
+@app.get("/requests/fragment", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(3)
+async def requests_fragment(
+    request: Request,
+    lang: str = "all",
+    status: str = "all",
+    page: int = 1,
+    per_page: int = 20,
+):
+    """Только список заявок и пагинация — для фильтров без перезагрузки страницы"""
+    async with read_session() as session:
+        requests_list, total = await fetch_requests_page(session, lang, status, page, per_page)
+
+    lang_names = (await reference_cache.get()).lang_names
+
+    return templates.TemplateResponse("includes/requests_list.html", {
+        "request": request,
+        "requests_list": requests_list,
+        "statuses": ["pending", "in_progress", "closed"],
+        "current_lang": lang,
+        "current_status": status,
+        "flags": flags,
+        "lang_names": lang_names,
+        "status_labels": status_labels,
+        "page": page,
+        "total_pages": (total + per_page - 1) // per_page,
+        "per_page": per_page,
+    }, headers={"X-Total-Count": str(total)})
+
+@app.get("/search", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(2)
+async def search_view(
+    request: Request,
+    q: str = "",
+    lang: str = "",
+    status: str = "",
+    date_from: str = "",
+    date_to: str = "",
+    page: int = 1,
+    per_page: int = 50,
+):
+    logger.info(f"🔎 /search q='{q}' lang='{lang}' status='{status}' dates={date_from}..{date_to} page={page}")
+
+    languages = (await reference_cache.get()).languages
+
+    # Индекс создаётся отдельным скриптом; до перезапуска после него поиск недоступен
+    search_available = request.app.state.search_available
+
+    async with read_session() as session:
+        results = []
+        if q.strip() and search_available:
+            results = await search_messages(
+                session, q,
+                lang=lang, status=status,
+                date_from=date_from, date_to=date_to,
+                limit=per_page + 1, offset=(page - 1) * per_page
+            )
+
+    # Запрошена одна лишняя строка — по ней видно, есть ли следующая страница
+    has_next = len(results) > per_page
+
+    return templates.TemplateResponse("search.html", {
+        "request": request,
+        "results": results[:per_page],
+        "search_available": search_available,
+        "query": q,
+        "current_lang": lang,
+        "current_status": status,
+        "date_from": date_from,
+        "date_to": date_to,
+        "languages": languages,
+        "statuses": ["pending", "in_progress", "closed"],
+        "flags": flags,
+        "lang_names": {l.code: l.name_ru for l in languages},
+        "status_labels": status_labels,
+        "page": page,
+        "has_next": has_next,
+    })
+
 @app.get("/chat/{request_id}", dependencies=[Depends(get_current_user)], response_class=HTMLResponse)
+@query_budget(5)
 async def chat_view(request: Request, request_id: int):
     client_ip = request.client.host
     current_user = request.scope.get("user")  # если добавляешь юзера в scope
 
     logger.info(f"💬 /chat/{request_id} requested by {current_user} from {client_ip}")
 
-    async with SessionLocal() as session:
+    # Чат закрытой заявки не меняется: отдаём готовую страницу, пока заявка не переоткрыта
+    cache_key = f"chat-{request_id}"
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        async with read_session() as session:
+            status = await session.scalar(
+                select(SupportRequest.status).where(SupportRequest.id == request_id)
+            )
+        if status == "closed":
+            return HTMLResponse(cached, headers={"X-Cache": "hit"})
+        logger.info(f"♻️ Request {request_id} reopened, cached chat dropped")
+        chat_cache.discard(cache_key)
+
+    async with read_session() as session:
         result = await session.execute(
             select(SupportRequest)
             .options(
@@ -557,18 +924,11 @@ async def chat_view(request: Request, request_id: int):
 
     messages = []
     for m in sorted(support_request.messages, key=lambda m: m.timestamp):
-        photo_url = None
-        if m.photo_file_id:
-            try:
-                photo_url = await resolve_photo_url(m.photo_file_id)
-            except Exception as e:
-                logger.error(f"❌ Error loading photo for message {m.id} in request {request_id}: {e}")
-                logger.debug(traceback.format_exc())
-
         messages.append({
             "text": m.text,
             "caption": m.caption,
-            "photo_url": photo_url,
+            # Ссылка на файл Telegram временная — получаем её при загрузке картинки
+            "photo_url": f"/chat/photo/{m.photo_file_id}" if m.photo_file_id else None,
             "timestamp": m.timestamp,
             "sender_id": m.sender_id,
             "is_user": m.sender_id == support_request.user.id,
@@ -577,11 +937,50 @@ async def chat_view(request: Request, request_id: int):
 
     logger.info(f"✅ Loaded chat for request {request_id} with {len(messages)} messages")
 
-    return templates.TemplateResponse("chat.html", {
+    response = templates.TemplateResponse("chat.html", {
         "request": request,
         "support": support_request,
         "messages": messages
     })
+    if support_request.status == "closed":
+        chat_cache.put(cache_key, response.body)
+        response.headers["X-Cache"] = "miss"
+    return response
+
+@app.get("/chat/photo/{file_id}", dependencies=[Depends(get_current_user)])
+@query_budget(1)
+async def chat_photo(file_id: str):
+    try:
+        return RedirectResponse(await resolve_photo_url(file_id), status_code=302)
+    except Exception as e:
+        logger.error(f"❌ Error loading photo {file_id}: {e}")
+        logger.debug(traceback.format_exc())
+        return Response(status_code=404)
+
+@app.get("/profiles", response_class=HTMLResponse)
+@query_budget(2)
+async def profiles_view(request: Request, user_id: str = Depends(get_current_user)):
+    if not await is_admin(user_id):
+        raise HTTPException(status_code=403, detail="Только для администраторов")
+    return templates.TemplateResponse("profiles.html", {
+        "request": request,
+        "profiles": list(profile_store.items),
+        "profile": None
+    })
+
+@app.get("/profiles/{profile_id}", response_class=HTMLResponse)
+@query_budget(2)
+async def profile_view(request: Request, profile_id: int, user_id: str = Depends(get_current_user)):
+    if not await is_admin(user_id):
+        raise HTTPException(status_code=403, detail="Только для администраторов")
+    profile = profile_store.get(profile_id)
+    if not profile:
+        return HTMLResponse("Profile not found", status_code=404)
+    return templates.TemplateResponse("profiles.html", {
+        "request": request,
+        "profiles": list(profile_store.items),
+        "profile": profile
+    })
 
 if __name__ == "__main__":
     uvicorn.run("main:app", reload=True)
\ No newline at end of file
@@ -1,14 +1,31 @@
 # models.py
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import List
 from datetime import datetime
-from config import DATABASE_URL 
+from config import DATABASE_URL, DATABASE_READ_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE
+
+
+def make_engine(url: str):
+    # Параметры пула — для MySQL; локальный SQLite работает с пулом по умолчанию
+    if url.startswith("sqlite"):
+        return create_async_engine(url)
+    return create_async_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE
+    )
+
 
-engine = create_async_engine(DATABASE_URL)
+engine = make_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+# Реплика только для чтения; без DATABASE_READ_URL — тот же primary
+read_engine = make_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 class User(Base):
@@ -68,6 +85,11 @@ class MessageHistory(Base):
 
     request = relationship("SupportRequest", back_populates="messages")
 
+    # Полнотекстовый поиск по сообщениям (MySQL); для SQLite — FTS5, см. services/message_search.py
+    __table_args__ = (
+        Index("ft_message_text", "text", "caption", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
 class Translation(Base):
     __tablename__ = "translations"
 
@@ -94,6 +116,26 @@ class Status(Base):
     role = Column(String(50))
     text = Column(Text, nullable=True) 
 
+class StatusEvent(Base):
+    """Очередь (outbox) событий смены роли для бота; id — курсор ленты"""
+    __tablename__ = "status_events"
+    # Курсор не должен переиспользовать id после удаления подтверждённых событий
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, nullable=False)      # Telegram ID
+    language_code = Column(String(3))
+    role = Column(String(50))
+    text = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CacheVersion(Base):
+    """Версия закешированного в процессах домена данных (translations, languages, groups)"""
+    __tablename__ = "cache_versions"
+
+    domain = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 class Credentials(Base):
     __tablename__ = "credentials"
 
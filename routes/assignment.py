@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import RedirectResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import SessionLocal
+from services.assignment import assignment_engine
+from utils.logger import logger
+
+router = APIRouter()
+
+@router.post("/requests/auto-assign")
+async def auto_assign_requests():
+    try:
+        async with SessionLocal() as session:
+            assigned = await assignment_engine.assign_pending(session)
+        logger.info(f"[POST /requests/auto-assign] ✅ Назначено заявок: {len(assigned)}")
+        return RedirectResponse(url="/requests", status_code=303)
+    except SQLAlchemyError as e:
+        logger.exception(f"[POST /requests/auto-assign] ❌ Ошибка базы данных: {e}")
+        raise HTTPException(status_code=500, detail="Ошибка базы данных")
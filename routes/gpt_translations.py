@@ -1,10 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from starlette.responses import JSONResponse
-from services.gpt_translate import translate_with_gpt
-from models import SessionLocal, Translation, Language
+from services.translation_providers import translate
+from models import SessionLocal, Translation
 from sqlalchemy import select, insert
 from collections import defaultdict
+from services.translation_coverage import coverage
+from services.cache_versions import cache_versions
+from services.reference_cache import reference_cache
 import traceback
 import logging
 
@@ -19,9 +22,8 @@ class TranslateRequest(BaseModel):
 async def gpt_translation_handler(data: TranslateRequest):
     try:
         async with SessionLocal() as session:
-            # Получаем язык из базы
-            lang_result = await session.execute(select(Language).where(Language.code == data.lang))
-            lang = lang_result.scalar_one_or_none()
+            # Язык — из справочника процесса
+            lang = (await reference_cache.get()).language(data.lang)
             if not lang:
                 raise HTTPException(status_code=404, detail="Язык не найден")
 
@@ -31,7 +33,7 @@ async def gpt_translation_handler(data: TranslateRequest):
             ru_dict = {row.key: row.text for row in ru_rows}
 
             # Запрашиваем перевод
-            translated_dict = await translate_with_gpt(
+            translated_dict, rejected = await translate(
                 ru_translations=ru_dict,
                 target_lang=lang.code,
                 lang_name=lang.name_ru,
@@ -39,6 +41,7 @@ async def gpt_translation_handler(data: TranslateRequest):
             )
 
             # Сохраняем переводы в базу
+            saved = {}
             for key, text in translated_dict.items():
                 if not text.strip():
                     continue
@@ -48,9 +51,15 @@ async def gpt_translation_handler(data: TranslateRequest):
                     text=text
                 ).prefix_with("IGNORE")
                 await session.execute(stmt)
+                saved[key] = text
 
+            await cache_versions.bump(session, "translations")
             await session.commit()
-            return JSONResponse({"status": "ok", "added": len(translated_dict)})
+            for key, text in saved.items():
+                coverage.add(key, lang.code, text)
+            if rejected:
+                logger.warning(f"[GPT TRANSLATE] ⚠ Отбракованы ключи ({lang.code}): {rejected}")
+            return JSONResponse({"status": "ok", "added": len(translated_dict), "rejected": rejected})
 
     except Exception as e:
         logger.exception(f"[GPT TRANSLATE] ❌ Ошибка перевода: {e}")
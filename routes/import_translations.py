@@ -0,0 +1,55 @@
+# routes/import_translations.py
+
+import csv
+from xml.etree.ElementTree import ParseError
+
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from starlette.responses import JSONResponse
+
+from models import SessionLocal
+from services.translation_coverage import coverage
+from services.cache_versions import cache_versions
+from services.reference_cache import reference_cache
+from services.translation_import import PARSERS, ImportFormatError, detect_format, import_translations
+from utils.query_budget import query_budget
+from utils.logger import logger
+
+router = APIRouter()
+
+# Запросов — по три на пачку строк: их число растёт с размером файла, поэтому
+# без ограничения; одинаковые формы — это пачки, а не N+1
+@router.post("/translations/import")
+@query_budget(None, repeat_limit=0)
+async def import_translations_handler(
+    file: UploadFile = File(...),
+    lang: str = Form(""),
+    format: str = Form(""),
+    dry_run: bool = Form(True)
+):
+    try:
+        file_format = detect_format(file.filename, format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    languages = {l.code for l in (await reference_cache.get()).languages}
+    entries = PARSERS[file_format](file.file)
+
+    async with SessionLocal() as session:
+        try:
+            report = await import_translations(session, entries, languages, lang, dry_run)
+        except (ImportFormatError, ParseError, UnicodeDecodeError, csv.Error) as e:
+            await session.rollback()
+            raise HTTPException(status_code=400, detail=f"Ошибка разбора файла: {e}")
+
+        written = report.pop("written")
+        if not dry_run and written:
+            await cache_versions.bump(session, "translations")
+            await session.commit()
+            for key, code, text in written:
+                coverage.put(key, code, text)
+
+    logger.info(
+        f"[IMPORT] {file.filename} ({file_format}, dry_run={dry_run}): rows={report['rows']} "
+        f"new={report['new']} changed={report['changed']} rejected={report['rejected']}"
+    )
+    return JSONResponse({"status": "ok", "format": file_format, **report})
@@ -5,6 +5,8 @@ from pydantic import BaseModel
 from sqlalchemy import insert
 from starlette.responses import JSONResponse
 from models import SessionLocal, Translation
+from services.translation_coverage import coverage
+from services.cache_versions import cache_versions
 
 router = APIRouter()
 
@@ -16,6 +18,7 @@ class BulkSaveRequest(BaseModel):
 async def save_translations_handler(data: BulkSaveRequest):
     try:
         async with SessionLocal() as session:
+            saved = {}
             for key, text in data.translations.items():
                 if not text.strip():
                     continue
@@ -25,7 +28,11 @@ async def save_translations_handler(data: BulkSaveRequest):
                     text=text
                 ).prefix_with("IGNORE")
                 await session.execute(stmt)
+                saved[key] = text
+            await cache_versions.bump(session, "translations")
             await session.commit()
+            for key, text in saved.items():
+                coverage.add(key, data.lang, text)
             return JSONResponse({"status": "ok", "saved": len(data.translations)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -2,53 +2,49 @@ from fastapi import APIRouter, Request, HTTPException
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, delete
+from sqlalchemy import delete
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 
-from models import SessionLocal, Language, SupportGroup, User, Translation, ModeratorGroupLink, SupportGroupLanguage
+from models import SessionLocal, Language, User, ModeratorGroupLink, SupportGroupLanguage
 from utils.utils import get_group_photo_url
+from utils.db import read_session
+from services.assignment import assignment_engine
+from services.translation_coverage import coverage
+from services.cache_versions import cache_versions
+from services.reference_cache import reference_cache
+from utils.profiling import instrument_templates
+from utils.query_budget import query_budget
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
+instrument_templates(templates)
 
 @router.get("/settings")
+@query_budget(2)
 async def settings_page(request: Request):
     try:
-        async with SessionLocal() as session:
-            result_languages = await session.execute(select(Language))
-            result_groups = await session.execute(
-                select(SupportGroup)
-                .options(
-                    selectinload(SupportGroup.languages),
-                    selectinload(SupportGroup.moderators)
-                )
-            )
+        reference = await reference_cache.get()
+        languages = reference.languages
+        groups = reference.groups
+
+        async with read_session() as session:
             result_users = await session.execute(
                 select(User).where(User.role == "moderator")
             )
-
-            # Языки без переводов (неактивируемые)
-            result_unavailable = await session.execute(
-                select(Language.code)
-                .outerjoin(Translation, Translation.lang == Language.code)
-                .group_by(Language.code)
-                .having(func.count(Translation.id) == 0)
-            )
-            unavailable_codes = {row[0] for row in result_unavailable}
-
-            # Финальные данные
-            languages = result_languages.scalars().all()
-            groups = result_groups.scalars().all()
             moderators = result_users.scalars().all()
 
+            # Языки без переводов (неактивируемые) — по индексу покрытия
+            await coverage.ensure_loaded()
+            unavailable_codes = {l.code for l in languages if not coverage.has_language(l.code)}
+
             return templates.TemplateResponse("settings.html", {
                 "request": request,
                 "languages": languages,
                 "groups": groups,
                 "moderators": moderators,
                 "unavailable_codes": unavailable_codes,
+                "coverage": coverage.summary(),
                 "get_photo_url": lambda path: get_group_photo_url(path)
             })
 
@@ -67,6 +63,7 @@ async def settings_page(request: Request):
         )
     
 @router.post("/settings/toggle-language/{code}")
+@query_budget(5)
 async def toggle_language(code: str):
     try:
         async with SessionLocal() as session:
@@ -74,13 +71,16 @@ async def toggle_language(code: str):
             if not lang:
                 raise HTTPException(status_code=404, detail="Язык не найден")
             lang.available = not lang.available
+            await cache_versions.bump(session, "languages")
             await session.commit()
+            await reference_cache.refresh()
             return RedirectResponse(url="/settings", status_code=303)
     except SQLAlchemyError as e:
         print(f"[DB ERROR toggle_language] {e}")
         raise HTTPException(status_code=500, detail="Ошибка базы данных")
 
 @router.post("/settings/assign-language/{group_id}")
+@query_budget(6)
 async def assign_language(group_id: int, request: Request):
     try:
         form = await request.form()
@@ -101,13 +101,17 @@ async def assign_language(group_id: int, request: Request):
                 return RedirectResponse(url="/settings", status_code=303)
 
             session.add(SupportGroupLanguage(group_id=group_id, language_code=language_code))
+            await cache_versions.bump(session, "groups")
             await session.commit()
+            assignment_engine.invalidate()
+            await reference_cache.refresh()
             return RedirectResponse(url="/settings", status_code=303)
     except SQLAlchemyError as e:
         print(f"[DB ERROR assign_language] {e}")
         raise HTTPException(status_code=500, detail="Ошибка базы данных")
 
 @router.post("/settings/unassign-language/{group_id}/{language_code}")
+@query_budget(4)
 async def unassign_language(group_id: int, language_code: str):
     try:
         async with SessionLocal() as session:
@@ -117,13 +121,17 @@ async def unassign_language(group_id: int, language_code: str):
                     SupportGroupLanguage.language_code == language_code
                 )
             )
+            await cache_versions.bump(session, "groups")
             await session.commit()
+            assignment_engine.invalidate()
+            await reference_cache.refresh()
             return RedirectResponse(url="/settings", status_code=303)
     except SQLAlchemyError as e:
         print(f"[DB ERROR unassign_language] {e}")
         raise HTTPException(status_code=500, detail="Ошибка базы данных")
 
 @router.post("/settings/assign-moderator/{group_id}")
+@query_budget(6)
 async def assign_moderator(group_id: int, request: Request):
     try:
         form = await request.form()
@@ -144,13 +152,17 @@ async def assign_moderator(group_id: int, request: Request):
                 return RedirectResponse(url="/settings", status_code=303)
 
             session.add(ModeratorGroupLink(group_id=group_id, moderator_id=moderator_id))
+            await cache_versions.bump(session, "groups")
             await session.commit()
+            assignment_engine.invalidate()
+            await reference_cache.refresh()
             return RedirectResponse(url="/settings", status_code=303)
     except SQLAlchemyError as e:
         print(f"[DB ERROR assign_moderator] {e}")
         raise HTTPException(status_code=500, detail="Ошибка базы данных")
 
 @router.post("/settings/unassign-moderator/{group_id}/{moderator_id}")
+@query_budget(4)
 async def unassign_moderator(group_id: int, moderator_id: int):
     try:
         async with SessionLocal() as session:
@@ -160,7 +172,10 @@ async def unassign_moderator(group_id: int, moderator_id: int):
                     ModeratorGroupLink.moderator_id == moderator_id
                 )
             )
+            await cache_versions.bump(session, "groups")
             await session.commit()
+            assignment_engine.invalidate()
+            await reference_cache.refresh()
             return RedirectResponse(url="/settings", status_code=303)
     except SQLAlchemyError as e:
         print(f"[DB ERROR unassign_moderator] {e}")
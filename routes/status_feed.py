@@ -0,0 +1,68 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.responses import JSONResponse
+
+from config import BOT_TOKEN, STATUS_FEED_MAX_TIMEOUT
+from models import SessionLocal
+from services.status_feed import status_feed
+from utils.logger import logger
+from utils.query_budget import query_budget
+
+router = APIRouter()
+
+class AckRequest(BaseModel):
+    cursor: int
+
+def check_bot_token(token: str | None):
+    # В ленте есть учётные данные админов — отдаём её только боту
+    if not BOT_TOKEN or not token or not secrets.compare_digest(token, BOT_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+# Ожидание перечитывает ленту после каждого пробуждения одним и тем же запросом — это не N+1
+@router.get("/api/status/feed")
+@query_budget(5, repeat_limit=0)
+async def status_feed_handler(
+    after: int = 0,
+    timeout: float = 25,
+    limit: int = 100,
+    x_bot_token: str | None = Header(None)
+):
+    check_bot_token(x_bot_token)
+    timeout = max(0, min(timeout, STATUS_FEED_MAX_TIMEOUT))
+    limit = max(1, min(limit, 1000))
+
+    try:
+        events = await status_feed.wait(after, timeout, limit)
+    except SQLAlchemyError as e:
+        logger.exception(f"[GET /api/status/feed] ❌ Ошибка базы данных: {e}")
+        raise HTTPException(status_code=500, detail="Ошибка базы данных")
+
+    return JSONResponse({
+        "events": [
+            {
+                "id": e.id,
+                "user_id": e.user_id,
+                "language_code": e.language_code,
+                "role": e.role,
+                "text": e.text,
+                "created_at": e.created_at.isoformat() if e.created_at else None
+            }
+            for e in events
+        ],
+        "cursor": events[-1].id if events else after
+    })
+
+@router.post("/api/status/ack")
+async def status_ack_handler(data: AckRequest, x_bot_token: str | None = Header(None)):
+    check_bot_token(x_bot_token)
+    try:
+        async with SessionLocal() as session:
+            deleted = await status_feed.ack(session, data.cursor)
+        logger.info(f"[POST /api/status/ack] ✅ Подтверждена доставка до {data.cursor}, удалено {deleted}")
+        return JSONResponse({"status": "ok", "deleted": deleted})
+    except SQLAlchemyError as e:
+        logger.exception(f"[POST /api/status/ack] ❌ Ошибка базы данных: {e}")
+        raise HTTPException(status_code=500, detail="Ошибка базы данных")
@@ -0,0 +1,76 @@
+"""
+Бенчмарк автоназначения заявок на локальной базе SQLite.
+
+    pip install aiosqlite
+    python scripts/bench_assignment.py --requests 20000 --moderators 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "bench_assignment.sqlite3")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select, func  # noqa: E402
+
+from models import (  # noqa: E402
+    engine, Base, SessionLocal, User, SupportRequest,
+    SupportGroup, SupportGroupLanguage, ModeratorGroupLink
+)
+from services.assignment import AssignmentEngine  # noqa: E402
+
+LANGS = ["ru", "en", "de", "pl", "es", "it"]
+
+
+async def seed(n_requests: int, n_moderators: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(insert(SupportGroup), [
+            {"id": i, "title": f"group {lang}", "photo_url": ""} for i, lang in enumerate(LANGS, 1)
+        ])
+        await conn.execute(insert(SupportGroupLanguage), [
+            {"group_id": i, "language_code": lang} for i, lang in enumerate(LANGS, 1)
+        ])
+
+        mods = [{"id": 1_000_000 + i, "username": f"mod{i}", "role": "moderator"} for i in range(n_moderators)]
+        await conn.execute(insert(User), mods + [{"id": 1, "username": "client", "role": "user"}])
+        await conn.execute(insert(ModeratorGroupLink), [
+            {"moderator_id": m["id"], "group_id": random.randint(1, len(LANGS))} for m in mods
+        ])
+        await conn.execute(insert(SupportRequest), [
+            {"user_id": 1, "status": "pending", "language": random.choice(LANGS)} for _ in range(n_requests)
+        ])
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--moderators", type=int, default=200)
+    args = parser.parse_args()
+
+    await seed(args.requests, args.moderators)
+
+    assigner = AssignmentEngine()
+    async with SessionLocal() as session:
+        started = time.perf_counter()
+        assigned = await assigner.assign_pending(session)
+        elapsed = time.perf_counter() - started
+
+        left = await session.scalar(
+            select(func.count()).select_from(SupportRequest).where(SupportRequest.status == "pending")
+        )
+
+    print(f"assigned={len(assigned)} pending_left={left} time={elapsed:.3f}s "
+          f"rate={len(assigned) / elapsed:,.0f}/s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
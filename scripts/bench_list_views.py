@@ -0,0 +1,145 @@
+"""
+Бенчмарк страниц /users и /requests: ORM-сущности (прежний путь) против
+проекции нужных колонок (services/list_views.py) на локальной базе SQLite.
+
+    pip install aiosqlite
+    python scripts/bench_list_views.py --rows 20000 --repeat 20
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "bench_list_views.sqlite3")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select, func  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from models import engine, Base, SessionLocal, User, SupportRequest  # noqa: E402
+from services.list_views import fetch_users_page, fetch_requests_page  # noqa: E402
+
+LANGS = ["ru", "en", "de", "pl", "es", "it"]
+STATUSES = ["pending", "in_progress", "closed"]
+
+
+async def orm_users_page(session, q, role, page, per_page):
+    result = await session.execute(
+        select(User, func.count().over().label("total"))
+        .order_by(User.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    return [row.User for row in rows], rows[0].total
+
+
+async def orm_requests_page(session, lang, status, page, per_page):
+    result = await session.execute(
+        select(SupportRequest, func.count().over().label("total"))
+        .options(joinedload(SupportRequest.user), joinedload(SupportRequest.moderator))
+        .order_by(SupportRequest.created_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    return [row.SupportRequest for row in rows], rows[0].total
+
+
+def touch_request(r):
+    # Те же атрибуты, что читает includes/requests_list.html
+    return (r.id, r.status, r.language, r.created_at, r.taken_at, r.closed_at,
+            r.user.full_name, r.user.username, r.moderator and r.moderator.full_name)
+
+
+def touch_user(u):
+    return (u.id, u.username, u.full_name, u.language_code, u.role)
+
+
+async def seed(n_rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "full_name": f"Пользователь {i}",
+             "language_code": random.choice(LANGS), "role": "moderator" if i % 50 == 0 else "user"}
+            for i in range(1, n_rows + 1)
+        ])
+        now = datetime.utcnow()
+        requests = []
+        for i in range(n_rows):
+            status = random.choice(STATUSES)
+            created = now - timedelta(minutes=i)
+            requests.append({
+                "user_id": random.randint(1, n_rows),
+                "status": status,
+                "language": random.choice(LANGS),
+                "assigned_moderator_id": 50 * random.randint(1, n_rows // 50) if status != "pending" else None,
+                "created_at": created,
+                "taken_at": created + timedelta(minutes=1) if status != "pending" else None,
+                "closed_at": created + timedelta(minutes=5) if status == "closed" else None,
+            })
+        await conn.execute(insert(SupportRequest), requests)
+
+
+async def measure(fetch, touch, args, repeat: int):
+    """Среднее время страницы (мс) и память на строку (байт), пока страница и сессия живы"""
+    async with SessionLocal() as session:
+        await fetch(session, *args)  # прогрев
+        started = time.perf_counter()
+        for _ in range(repeat):
+            items, _ = await fetch(session, *args)
+            for item in items:
+                touch(item)
+            session.expunge_all()
+        per_page_ms = (time.perf_counter() - started) / repeat * 1000
+
+    async with SessionLocal() as session:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        items, _ = await fetch(session, *args)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        rows = len(items)
+        del items
+
+    return per_page_ms, used / rows
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    await seed(args.rows)
+
+    cases = [
+        ("users", orm_users_page, fetch_users_page, touch_user, ("", "")),
+        ("requests", orm_requests_page, fetch_requests_page, touch_request, ("all", "all")),
+    ]
+    for per_page in (100, 1000):
+        for name, orm_fetch, projection_fetch, touch, filters in cases:
+            fetch_args = (*filters, 1, per_page)
+            orm_ms, orm_bytes = await measure(orm_fetch, touch, fetch_args, args.repeat)
+            proj_ms, proj_bytes = await measure(projection_fetch, touch, fetch_args, args.repeat)
+            print(f"{name:<8} per_page={per_page:<5} "
+                  f"orm: {orm_ms:7.2f} ms/page {orm_bytes:7.0f} B/row | "
+                  f"projection: {proj_ms:7.2f} ms/page {proj_bytes:7.0f} B/row | "
+                  f"x{orm_ms / proj_ms:.1f} faster, x{orm_bytes / proj_bytes:.1f} less memory")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+"""
+Замер времени импорта main (import-to-ready) в чистом процессе.
+
+    python scripts/bench_startup.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(f"{elapsed:.6f} {int('openai' in sys.modules)} {int('httpx' in sys.modules)}")
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+    times = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        times.append(float(out[0]))
+        openai_loaded, httpx_loaded = out[1] == "1", out[2] == "1"
+
+    print(f"import main: median={statistics.median(times) * 1000:.1f} ms "
+          f"min={min(times) * 1000:.1f} ms max={max(times) * 1000:.1f} ms "
+          f"(openai imported: {openai_loaded}, httpx imported: {httpx_loaded})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Создание полнотекстового индекса по сообщениям (FULLTEXT на MySQL, FTS5 на SQLite).
+На большой таблице MySQL строится долго — запускать отдельно от деплоя.
+
+    python scripts/create_search_index.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import engine  # noqa: E402
+from services.message_search import ensure_search_index  # noqa: E402
+
+
+async def main():
+    await ensure_search_index(create_mysql_index=True)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
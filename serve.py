@@ -0,0 +1,20 @@
+# serve.py — продакшен-запуск: несколько воркеров uvicorn без reload.
+#
+# Каждый воркер — отдельный процесс со своими кешами. Планировщик автоназначения
+# (AUTO_ASSIGN_INTERVAL > 0) стартует во всех воркерах, но назначает заявки только
+# тот, кто держит блокировку MySQL GET_LOCK("auto_assign_scheduler"); остальные
+# ждут и перехватывают её, если ведущий воркер остановится.
+import uvicorn
+
+from config import WEB_HOST, WEB_PORT, WEB_WORKERS
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "main:app",
+        host=WEB_HOST,
+        port=WEB_PORT,
+        workers=WEB_WORKERS,
+        lifespan="on",
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
@@ -0,0 +1,266 @@
+import asyncio
+import heapq
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+from sqlalchemy import select, update, func, bindparam, text
+
+from config import AUTO_ASSIGN_MAX_ACTIVE, AUTO_ASSIGN_RELOAD_INTERVAL
+from models import engine as db_engine, SessionLocal, SupportRequest, User, ModeratorGroupLink, SupportGroupLanguage
+from utils.logger import logger
+
+
+class AssignmentEngine:
+    """
+    Автоматическое распределение заявок (pending) между модераторами.
+
+    В памяти держится очередь ожидающих заявок по языкам и индекс загрузки
+    модераторов: для каждого языка — куча (число заявок in_progress, id модератора)
+    по модераторам, чьи группы обслуживают этот язык. Выбор наименее загруженного
+    модератора — O(log n), устаревшие записи кучи отбрасываются при извлечении.
+    """
+
+    def __init__(self, max_active: int = 0, reload_interval: float = 60):
+        self.max_active = max_active              # 0 — без ограничения
+        self.reload_interval = reload_interval    # полная пересборка индекса, сек
+        self.lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.queues: dict[str, deque[int]] = defaultdict(deque)
+        self.queued: set[int] = set()
+        self.load: dict[int, int] = {}
+        self.moderator_langs: dict[int, set[str]] = {}
+        self.heaps: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self.last_pending_id = 0
+        self.loaded_at = None
+
+    def invalidate(self):
+        """Сбрасывает индекс — при следующем запуске он будет загружен из базы заново."""
+        self.loaded_at = None
+
+    async def reload(self, session):
+        self._reset()
+
+        mods = await session.execute(select(User.id).where(User.role == "moderator"))
+        for (mod_id,) in mods:
+            self.moderator_langs[mod_id] = set()
+            self.load[mod_id] = 0
+
+        links = await session.execute(
+            select(ModeratorGroupLink.moderator_id, SupportGroupLanguage.language_code)
+            .join(SupportGroupLanguage, SupportGroupLanguage.group_id == ModeratorGroupLink.group_id)
+        )
+        for mod_id, code in links:
+            if mod_id in self.moderator_langs:
+                self.moderator_langs[mod_id].add(code)
+
+        active = await session.execute(
+            select(SupportRequest.assigned_moderator_id, func.count())
+            .where(SupportRequest.status == "in_progress")
+            .group_by(SupportRequest.assigned_moderator_id)
+        )
+        for mod_id, cnt in active:
+            if mod_id in self.load:
+                self.load[mod_id] = cnt
+
+        for mod_id in self.moderator_langs:
+            self._push(mod_id)
+
+        await self._fetch_pending(session)
+        self.loaded_at = time.monotonic()
+
+        logger.info(
+            f"[ASSIGN] Индекс загружен: moderators={len(self.load)}, pending={len(self.queued)}"
+        )
+
+    async def _fetch_pending(self, session):
+        """Добавляет в очереди заявки pending, появившиеся после последней загрузки."""
+        result = await session.execute(
+            select(SupportRequest.id, SupportRequest.language)
+            .where(
+                SupportRequest.status == "pending",
+                SupportRequest.id > self.last_pending_id
+            )
+            .order_by(SupportRequest.id)
+        )
+        for request_id, lang in result:
+            self.enqueue(request_id, lang)
+            self.last_pending_id = max(self.last_pending_id, request_id)
+
+    def enqueue(self, request_id: int, language: str):
+        if request_id in self.queued:
+            return
+        self.queued.add(request_id)
+        self.queues[language].append(request_id)
+
+    def release(self, moderator_id: int):
+        """Уменьшает загрузку модератора (заявка закрыта или не досталась ему)."""
+        if self.load.get(moderator_id, 0) > 0:
+            self.load[moderator_id] -= 1
+            self._push(moderator_id)
+
+    def _push(self, moderator_id: int):
+        load = self.load[moderator_id]
+        for lang in self.moderator_langs[moderator_id]:
+            heapq.heappush(self.heaps[lang], (load, moderator_id))
+
+    def _pick(self, lang: str):
+        """Наименее загруженный модератор для языка или None."""
+        heap = self.heaps.get(lang)
+        while heap:
+            load, mod_id = heap[0]
+            if self.load.get(mod_id) != load:
+                heapq.heappop(heap)
+                continue
+            if self.max_active and load >= self.max_active:
+                return None
+            return mod_id
+        return None
+
+    def _plan(self) -> list[tuple[int, int]]:
+        planned = []
+        for lang, queue in self.queues.items():
+            while queue:
+                mod_id = self._pick(lang)
+                if mod_id is None:
+                    break
+                request_id = queue.popleft()
+                self.queued.discard(request_id)
+                self.load[mod_id] += 1
+                self._push(mod_id)
+                planned.append((request_id, mod_id))
+        return planned
+
+    async def _verify(self, session, planned):
+        """Отбирает заявки, которые действительно достались назначенным модераторам."""
+        ids = [request_id for request_id, _ in planned]
+        result = await session.execute(
+            select(SupportRequest.id, SupportRequest.assigned_moderator_id)
+            .where(SupportRequest.id.in_(ids))
+        )
+        actual = dict(result.all())
+        assigned = []
+        for request_id, mod_id in planned:
+            if actual.get(request_id) == mod_id:
+                assigned.append((request_id, mod_id))
+            else:
+                self.release(mod_id)
+        return assigned
+
+    async def assign_pending(self, session) -> list[tuple[int, int]]:
+        """
+        Назначает ожидающие заявки и сохраняет результат одной транзакцией.
+        Возвращает список пар (id заявки, id модератора).
+        """
+        async with self.lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at > self.reload_interval:
+                await self.reload(session)
+            else:
+                await self._fetch_pending(session)
+
+            planned = self._plan()
+            if not planned:
+                return []
+
+            now = datetime.utcnow()
+            table = SupportRequest.__table__
+            try:
+                # Одно UPDATE на пачку (executemany); условие по статусу защищает
+                # от гонки с ручным взятием заявки модератором
+                result = await session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("rid"), table.c.status == "pending")
+                    .values(assigned_moderator_id=bindparam("mid"), taken_at=now, status="in_progress"),
+                    [{"rid": request_id, "mid": mod_id} for request_id, mod_id in planned]
+                )
+                assigned = planned
+                if result.rowcount != len(planned):
+                    assigned = await self._verify(session, planned)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                self.invalidate()
+                raise
+
+            logger.info(f"[ASSIGN] Назначено заявок: {len(assigned)} из {len(planned)}")
+            return assigned
+
+
+# Именованная блокировка MySQL: планировщик работает только в воркере, который её держит
+SCHEDULER_LOCK = "auto_assign_scheduler"
+
+
+async def acquire_scheduler_lock():
+    """
+    Соединение, держащее блокировку планировщика, или None, если её держит другой процесс.
+    Блокировка живёт, пока открыто соединение: если воркер-лидер упадёт,
+    её подхватит другой. На SQLite (локальный запуск, один процесс) — без блокировки.
+    """
+    conn = await db_engine.connect()
+    try:
+        if conn.dialect.name == "mysql":
+            acquired = await conn.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": SCHEDULER_LOCK})
+            if acquired != 1:
+                await conn.close()
+                return None
+        return conn
+    except Exception:
+        await release_scheduler_lock(conn)
+        raise
+
+
+async def release_scheduler_lock(conn):
+    # close() лишь вернул бы соединение в пул, и блокировка осталась бы за ним.
+    # Снимаем её явно и выбрасываем соединение из пула: если RELEASE_LOCK
+    # не прошёл (соединение разорвано), сервер снимет блокировку при закрытии
+    try:
+        if conn.dialect.name == "mysql":
+            await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": SCHEDULER_LOCK})
+    except Exception as e:
+        logger.debug(f"[ASSIGN] RELEASE_LOCK не выполнен: {e}")
+    try:
+        await conn.invalidate()
+        await conn.close()
+    except Exception as e:
+        logger.debug(f"[ASSIGN] Соединение блокировки закрыто с ошибкой: {e}")
+
+
+async def run_scheduler(engine: AssignmentEngine, interval: float):
+    """
+    Фоновый цикл автоназначения. Запускается в каждом воркере, но назначает
+    только держатель блокировки — у остальных индексы загрузки не конкурируют
+    за одни и те же заявки; они лишь пытаются перехватить блокировку раз в interval.
+    """
+    logger.info(f"[ASSIGN] Планировщик запущен, интервал {interval} сек")
+    lock_conn = None
+    try:
+        while True:
+            try:
+                if lock_conn is None:
+                    lock_conn = await acquire_scheduler_lock()
+                    if lock_conn is not None:
+                        logger.info("[ASSIGN] Воркер стал ведущим планировщиком")
+                        # Пока назначал другой воркер, индекс этого устарел
+                        engine.invalidate()
+                if lock_conn is not None:
+                    # Соединение с блокировкой живо — иначе её мог взять другой воркер
+                    await lock_conn.execute(text("SELECT 1"))
+                    async with SessionLocal() as session:
+                        await engine.assign_pending(session)
+            except Exception as e:
+                logger.exception(f"[ASSIGN] ❌ Ошибка автоназначения: {e}")
+                if lock_conn is not None:
+                    await release_scheduler_lock(lock_conn)
+                    lock_conn = None
+            await asyncio.sleep(interval)
+    finally:
+        if lock_conn is not None:
+            await release_scheduler_lock(lock_conn)
+
+
+assignment_engine = AssignmentEngine(
+    max_active=AUTO_ASSIGN_MAX_ACTIVE,
+    reload_interval=AUTO_ASSIGN_RELOAD_INTERVAL
+)
@@ -0,0 +1,104 @@
+import time
+from collections import defaultdict
+
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import CACHE_VERSION_CHECK_INTERVAL
+from models import engine, SessionLocal, CacheVersion
+from utils.logger import logger
+
+DOMAINS = ("translations", "languages", "groups")
+
+
+class CacheVersions:
+    """
+    Согласование кешей процесса между воркерами.
+
+    На каждый домен в таблице cache_versions хранится номер версии. Запись
+    увеличивает его в той же транзакции (bump), а каждый воркер перед
+    обработкой запроса сверяет версии одним запросом по маленькой таблице
+    и сбрасывает кеши доменов, изменённых другими воркерами.
+    """
+
+    def __init__(self, check_interval: float = 0):
+        self.check_interval = check_interval
+        self.known: dict[str, int] = {}
+        self.listeners = defaultdict(list)
+        self.checked_at = 0.0
+
+    def subscribe(self, domain: str, callback):
+        """callback() вызывается, когда домен изменён другим процессом"""
+        self.listeners[domain].append(callback)
+
+    def _changed(self, domain: str):
+        for callback in self.listeners[domain]:
+            callback()
+
+    async def bump(self, session, domain: str):
+        """Увеличивает версию домена в текущей транзакции; применяется после коммита"""
+        await session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.domain == domain)
+            .values(version=CacheVersion.version + 1)
+        )
+        version = await session.scalar(
+            select(CacheVersion.version).where(CacheVersion.domain == domain)
+        )
+        session.sync_session.info.setdefault("cache_bumps", []).append((domain, version))
+
+    def _committed(self, domain: str, version: int):
+        # Если между нашей и предыдущей известной версией никто не писал,
+        # локальный кеш уже обновлён самим обработчиком записи
+        if self.known.get(domain) != version - 1:
+            self._changed(domain)
+        self.known[domain] = version
+
+    async def sync(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.checked_at < self.check_interval:
+            return
+        self.checked_at = now
+
+        async with SessionLocal() as session:
+            result = await session.execute(select(CacheVersion.domain, CacheVersion.version))
+            versions = dict(result.all())
+
+        for domain, version in versions.items():
+            known = self.known.get(domain)
+            if known is not None and known != version:
+                logger.debug(f"[CACHE] Домен '{domain}' изменён другим воркером: {known} → {version}")
+                self._changed(domain)
+            self.known[domain] = version
+
+    async def prepare(self):
+        """Создаёт таблицу версий и недостающие строки доменов"""
+        async with engine.begin() as conn:
+            await conn.run_sync(CacheVersion.__table__.create, checkfirst=True)
+        async with SessionLocal() as session:
+            result = await session.execute(select(CacheVersion.domain))
+            existing = set(result.scalars().all())
+            for domain in DOMAINS:
+                if domain not in existing:
+                    session.add(CacheVersion(domain=domain, version=0))
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Строки одновременно создал другой воркер
+                await session.rollback()
+        await self.sync(force=True)
+
+
+cache_versions = CacheVersions(check_interval=CACHE_VERSION_CHECK_INTERVAL)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_cache_bumps(session):
+    for domain, version in session.info.pop("cache_bumps", []):
+        cache_versions._committed(domain, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_cache_bumps(session):
+    session.info.pop("cache_bumps", None)
@@ -0,0 +1,108 @@
+from sqlalchemy import select, func
+
+from models import User, SupportRequest
+
+# Списки /users и /requests читаются одним Core-запросом только нужных колонок:
+# без ORM-сущностей, identity map и дополнительных запросов за связями.
+
+users_table = User.__table__
+requests_table = SupportRequest.__table__
+authors = users_table.alias("author")
+moderators = users_table.alias("moderator")
+
+
+class PersonRow:
+    __slots__ = ("full_name", "username")
+
+    def __init__(self, full_name, username):
+        self.full_name = full_name
+        self.username = username
+
+
+class RequestRow:
+    """Строка списка заявок; user и moderator — PersonRow или None"""
+
+    __slots__ = ("id", "status", "language", "created_at", "taken_at", "closed_at", "user", "moderator")
+
+    def __init__(self, row):
+        self.id = row.id
+        self.status = row.status
+        self.language = row.language
+        self.created_at = row.created_at
+        self.taken_at = row.taken_at
+        self.closed_at = row.closed_at
+        self.user = PersonRow(row.user_full_name, row.user_username) \
+            if row.user_id is not None else None
+        self.moderator = PersonRow(row.moderator_full_name, row.moderator_username) \
+            if row.moderator_id is not None else None
+
+
+def users_filters(q: str, role: str) -> list:
+    filters = []
+    if q:
+        like = f"%{q.lower()}%"
+        filters.append(
+            func.lower(users_table.c.username).like(like) | func.lower(users_table.c.full_name).like(like)
+        )
+    if role:
+        filters.append(users_table.c.role == role)
+    return filters
+
+
+async def fetch_users_page(session, q: str, role: str, page: int, per_page: int):
+    """
+    Страница пользователей (строки с id, username, full_name, language_code, role)
+    и их общее число по фильтру — одним запросом (COUNT(*) OVER ())
+    """
+    filters = users_filters(q, role)
+    c = users_table.c
+    result = await session.execute(
+        select(c.id, c.username, c.full_name, c.language_code, c.role, func.count().over().label("total"))
+        .where(*filters)
+        .order_by(c.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    if rows:
+        return rows, rows[0].total
+    # Пустая страница: общее число считаем отдельно
+    total = await session.scalar(select(func.count()).select_from(users_table).where(*filters))
+    return [], total
+
+
+async def fetch_requests_page(session, lang: str, status: str, page: int, per_page: int):
+    """Страница заявок с именами пользователя и модератора и общее число по фильтру — одним запросом"""
+    c = requests_table.c
+    filters = []
+    if lang != "all":
+        filters.append(c.language == lang)
+    if status != "all":
+        filters.append(c.status == status)
+
+    result = await session.execute(
+        select(
+            c.id, c.status, c.language, c.created_at, c.taken_at, c.closed_at,
+            authors.c.id.label("user_id"),
+            authors.c.full_name.label("user_full_name"),
+            authors.c.username.label("user_username"),
+            moderators.c.id.label("moderator_id"),
+            moderators.c.full_name.label("moderator_full_name"),
+            moderators.c.username.label("moderator_username"),
+            func.count().over().label("total")
+        )
+        .select_from(
+            requests_table
+            .outerjoin(authors, authors.c.id == c.user_id)
+            .outerjoin(moderators, moderators.c.id == c.assigned_moderator_id)
+        )
+        .where(*filters)
+        .order_by(c.created_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    rows = result.all()
+    if rows:
+        return [RequestRow(row) for row in rows], rows[0].total
+    total = await session.scalar(select(func.count()).select_from(requests_table).where(*filters))
+    return [], total
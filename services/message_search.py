@@ -0,0 +1,187 @@
+import re
+from datetime import datetime, timedelta
+
+from markupsafe import Markup, escape
+from sqlalchemy import select, literal_column, inspect, table, column
+from sqlalchemy.dialects.mysql import match
+
+from models import engine, MessageHistory, SupportRequest, User
+from utils.logger import logger
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# SQLite: внешний FTS5-индекс над message_history, обновляется триггерами
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+        text, caption,
+        content='message_history', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS message_search_ai AFTER INSERT ON message_history BEGIN
+        INSERT INTO message_search(rowid, text, caption) VALUES (new.id, new.text, new.caption);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS message_search_ad AFTER DELETE ON message_history BEGIN
+        INSERT INTO message_search(message_search, rowid, text, caption)
+        VALUES ('delete', old.id, old.text, old.caption);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS message_search_au AFTER UPDATE ON message_history BEGIN
+        INSERT INTO message_search(message_search, rowid, text, caption)
+        VALUES ('delete', old.id, old.text, old.caption);
+        INSERT INTO message_search(rowid, text, caption) VALUES (new.id, new.text, new.caption);
+    END
+    """,
+]
+
+MYSQL_FULLTEXT_INDEX = "ft_message_text"
+
+message_search_fts = table("message_search", column("rowid"))
+
+
+def _ensure_sqlite_index(conn):
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'message_search'"
+    ).first()
+    for ddl in SQLITE_FTS_DDL:
+        conn.exec_driver_sql(ddl)
+    if not exists:
+        # Индекс создан впервые — наполняем его существующими сообщениями
+        conn.exec_driver_sql("INSERT INTO message_search(message_search) VALUES ('rebuild')")
+        logger.info("[SEARCH] FTS5-индекс сообщений построен")
+
+
+def _has_mysql_index(conn) -> bool:
+    indexes = inspect(conn).get_indexes(MessageHistory.__tablename__)
+    return any(index["name"] == MYSQL_FULLTEXT_INDEX for index in indexes)
+
+
+async def ensure_search_index(create_mysql_index: bool = False) -> bool:
+    """
+    SQLite: создаёт FTS5-индекс и триггеры (быстро, вызывается при старте).
+    MySQL: FULLTEXT-индекс на большой таблице строится долго, поэтому при старте
+    только проверяется; создать его — scripts/create_search_index.py.
+    Возвращает, доступен ли поиск: без индекса MATCH ... AGAINST падает с ошибкой.
+    """
+    async with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            await conn.run_sync(_ensure_sqlite_index)
+            return True
+        if conn.dialect.name != "mysql":
+            return False
+        if await conn.run_sync(_has_mysql_index):
+            return True
+        if not create_mysql_index:
+            logger.warning("[SEARCH] ⚠ Нет FULLTEXT-индекса message_history, поиск недоступен")
+            return False
+        logger.info("[SEARCH] Создание FULLTEXT-индекса message_history...")
+        await conn.exec_driver_sql(
+            f"ALTER TABLE message_history ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (text, caption)"
+        )
+        logger.info("[SEARCH] ✅ FULLTEXT-индекс создан")
+        return True
+
+
+def parse_date(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def make_snippet(content: str, words: list[str], width: int = 80) -> Markup:
+    """Фрагмент сообщения вокруг первого совпадения с подсветкой найденных слов"""
+    if not content:
+        return Markup("")
+    pattern = re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE) if words else None
+    found = pattern.search(content) if pattern else None
+    start = max(0, found.start() - width // 2) if found else 0
+    end = min(len(content), start + width * 2)
+    fragment = content[start:end]
+
+    parts = []
+    pos = 0
+    for m in (pattern.finditer(fragment) if pattern else []):
+        parts.append(escape(fragment[pos:m.start()]))
+        parts.append(Markup("<mark>") + escape(m.group()) + Markup("</mark>"))
+        pos = m.end()
+    parts.append(escape(fragment[pos:]))
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(content) else ""
+    return Markup(prefix) + Markup("").join(parts) + Markup(suffix)
+
+
+def matched_field(message: MessageHistory, words: list[str]) -> str:
+    """Текст сообщения, если совпадение в нём, иначе подпись к фото"""
+    lowered = (message.text or "").lower()
+    if message.text and any(w.lower() in lowered for w in words):
+        return message.text
+    return message.caption or message.text or ""
+
+
+async def search_messages(
+    session,
+    query: str,
+    lang: str = "",
+    status: str = "",
+    date_from: str = "",
+    date_to: str = "",
+    limit: int = 50,
+    offset: int = 0
+) -> list[dict]:
+    """Ранжированный поиск по тексту и подписям сообщений с заявкой-владельцем"""
+    words = WORD_RE.findall(query)
+    if not words:
+        return []
+
+    dialect = session.bind.dialect.name
+    if dialect == "mysql":
+        score = match(MessageHistory.text, MessageHistory.caption, against=query) \
+            .in_natural_language_mode()
+        stmt = select(MessageHistory, SupportRequest, User.full_name, score.label("score")) \
+            .where(score > 0) \
+            .order_by(score.desc())
+    elif dialect == "sqlite":
+        # Каждое слово — префиксный термин FTS5; кавычки экранируют синтаксис запроса
+        fts_query = " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+        score = literal_column("bm25(message_search)")
+        stmt = select(MessageHistory, SupportRequest, User.full_name, score.label("score")) \
+            .join(message_search_fts, message_search_fts.c.rowid == MessageHistory.id) \
+            .where(literal_column("message_search").match(fts_query)) \
+            .order_by(score)
+    else:
+        raise RuntimeError(f"Поиск не поддерживается для {dialect}")
+
+    stmt = stmt \
+        .join(SupportRequest, SupportRequest.id == MessageHistory.request_id) \
+        .outerjoin(User, User.id == SupportRequest.user_id)
+
+    if lang:
+        stmt = stmt.where(SupportRequest.language == lang)
+    if status:
+        stmt = stmt.where(SupportRequest.status == status)
+    if parse_date(date_from):
+        stmt = stmt.where(MessageHistory.timestamp >= parse_date(date_from))
+    if parse_date(date_to):
+        stmt = stmt.where(MessageHistory.timestamp < parse_date(date_to) + timedelta(days=1))
+
+    result = await session.execute(stmt.limit(limit).offset(offset))
+
+    return [
+        {
+            "message_id": message.id,
+            "request_id": support.id,
+            "snippet": make_snippet(matched_field(message, words), words),
+            "timestamp": message.timestamp,
+            "language": support.language,
+            "status": support.status,
+            "user_name": user_name,
+        }
+        for message, support, user_name, _ in result.all()
+    ]
@@ -0,0 +1,115 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from config import CHAT_CACHE_MAX_BYTES, CHAT_CACHE_DIR
+from utils.logger import logger
+
+
+class PageCache:
+    """
+    Кеш готовых HTML-страниц, которые больше не меняются (чаты закрытых заявок).
+
+    В памяти — LRU с ограничением по суммарному размеру; вытесненные страницы
+    сохраняются на диск (если задан каталог) и поднимаются обратно в память
+    при следующем обращении. Актуальность записи проверяет вызывающий код.
+    Версия (хеш шаблона) входит в имена файлов: после деплоя с новой разметкой
+    страницы прежней версии не отдаются, а prune() удаляет их с диска.
+    """
+
+    def __init__(self, max_bytes: int, directory: str = None, version: str = ""):
+        self.max_bytes = max_bytes
+        self.directory = directory or None
+        self.version = version
+        self.items: OrderedDict[str, bytes] = OrderedDict()
+        self.size = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{self.version}-{key}.html")
+
+    def prune(self) -> int:
+        """Удаляет с диска страницы других версий; возвращает их число"""
+        if not self.directory:
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.startswith(f"{self.version}-"):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def get(self, key: str):
+        body = self.items.get(key)
+        if body is not None:
+            self.items.move_to_end(key)
+            return body
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        self._remember(key, body)
+        return body
+
+    def put(self, key: str, body: bytes):
+        self._forget(key)
+        self._remember(key, body)
+
+    def discard(self, key: str):
+        self._forget(key)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key: str, body: bytes):
+        if len(body) > self.max_bytes:
+            self._spill(key, body)
+            return
+        self.items[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            old_key, old_body = self.items.popitem(last=False)
+            self.size -= len(old_body)
+            self._spill(old_key, old_body)
+
+    def _forget(self, key: str):
+        body = self.items.pop(key, None)
+        if body is not None:
+            self.size -= len(body)
+
+    def _spill(self, key: str, body: bytes):
+        if not self.directory:
+            return
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        # Через временный файл: параллельный воркер не прочитает недописанную страницу
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"[PAGE CACHE] ⚠ Не удалось сохранить {key} на диск: {e}")
+
+
+def source_version(*paths: str) -> str:
+    """Короткий хеш содержимого файлов — меняется вместе с ними"""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+chat_cache = PageCache(CHAT_CACHE_MAX_BYTES, CHAT_CACHE_DIR, source_version("templates/chat.html"))
@@ -0,0 +1,73 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from models import SessionLocal, Language, SupportGroup
+from utils.logger import logger
+from utils.query_budget import uncounted
+
+
+class ReferenceCache:
+    """
+    Справочные данные процесса: языки и группы поддержки со связями.
+
+    Меняются только через обработчики /settings, поэтому загружаются один раз
+    (при старте или первом обращении) и перечитываются после изменений —
+    своих (refresh) или другого воркера (invalidate по версии домена).
+    Объекты отсоединены от сессии: только для чтения.
+    """
+
+    def __init__(self):
+        self.languages: list[Language] = []
+        self.groups: list[SupportGroup] = []
+        self.loaded = False
+        self.lock = asyncio.Lock()
+
+    @property
+    def lang_names(self) -> dict[str, str]:
+        return {l.code: l.name_ru for l in self.languages}
+
+    @property
+    def available_languages(self) -> list[Language]:
+        return [l for l in self.languages if l.available]
+
+    def language(self, code: str):
+        return next((l for l in self.languages if l.code == code), None)
+
+    async def _load(self):
+        with uncounted():
+            async with SessionLocal() as session:
+                languages = await session.execute(select(Language))
+                groups = await session.execute(
+                    select(SupportGroup)
+                    .options(
+                        selectinload(SupportGroup.languages),
+                        selectinload(SupportGroup.moderators)
+                    )
+                )
+                self.languages = languages.scalars().all()
+                self.groups = groups.scalars().all()
+        self.loaded = True
+        logger.debug(
+            f"[REFERENCE] Справочники загружены: languages={len(self.languages)}, groups={len(self.groups)}"
+        )
+
+    async def refresh(self):
+        """Перечитывает справочники всегда — после записи в них"""
+        async with self.lock:
+            await self._load()
+
+    async def get(self) -> "ReferenceCache":
+        if not self.loaded:
+            async with self.lock:
+                # Пока ждали блокировку, справочники мог загрузить другой запрос
+                if not self.loaded:
+                    await self._load()
+        return self
+
+    def invalidate(self):
+        self.loaded = False
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import time
+
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from config import STATUS_FEED_POLL_INTERVAL
+from models import engine, SessionLocal, Status, StatusEvent
+from utils.logger import logger
+
+
+class StatusFeed:
+    """
+    Лента событий status_events для бота с long-poll ожиданием.
+
+    Запись в ленту будит ожидающих в этом процессе сразу после коммита.
+    События, записанные другими воркерами, замечает общий для процесса
+    наблюдатель: пока есть ожидающие, он раз в poll_interval секунд читает
+    MAX(id) ленты и будит их, если он вырос. Задержка доставки между
+    воркерами — не больше poll_interval (по умолчанию 0.5 сек) при одном
+    лёгком запросе на процесс, а не на каждого ожидающего.
+    """
+
+    def __init__(self, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self.last_id = 0
+        self.changed = asyncio.Event()
+        self.waiters = 0
+        self.watcher = None
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def fetch(self, after: int, limit: int) -> list[StatusEvent]:
+        # Короткая сессия на каждую проверку: соединение не держится на время
+        # ожидания, а новая транзакция видит свежие строки
+        async with SessionLocal() as session:
+            result = await session.execute(
+                select(StatusEvent)
+                .where(StatusEvent.id > after)
+                .order_by(StatusEvent.id)
+                .limit(limit)
+            )
+            events = result.scalars().all()
+        if events:
+            self.last_id = max(self.last_id, events[-1].id)
+        return events
+
+    async def _watch(self):
+        try:
+            while self.waiters:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    async with SessionLocal() as session:
+                        max_id = await session.scalar(select(func.max(StatusEvent.id)))
+                except Exception as e:
+                    logger.warning(f"[STATUS FEED] ⚠ Ошибка проверки ленты: {e}")
+                    continue
+                if max_id and max_id > self.last_id:
+                    self.last_id = max_id
+                    self.notify()
+        finally:
+            self.watcher = None
+
+    def _ensure_watcher(self):
+        if self.watcher is None:
+            # Пустой контекст: запросы наблюдателя не попадают в профиль
+            # и бюджет запросов HTTP-запроса, который его запустил
+            self.watcher = contextvars.Context().run(asyncio.create_task, self._watch())
+
+    async def wait(self, after: int, timeout: float, limit: int = 100) -> list[StatusEvent]:
+        """Возвращает события после курсора; если их нет — ждёт до timeout секунд"""
+        deadline = time.monotonic() + timeout
+        checked = False
+
+        self.waiters += 1
+        self._ensure_watcher()
+        try:
+            while True:
+                # Пока курсор не догнал известный максимум — события точно есть
+                if not checked or after < self.last_id:
+                    events = await self.fetch(after, limit)
+                    checked = True
+                    if events:
+                        return events
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+
+                try:
+                    await asyncio.wait_for(self.changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return []
+                checked = False
+        finally:
+            self.waiters -= 1
+
+    async def ack(self, session, cursor: int) -> int:
+        """Подтверждает доставку: удаляет события с id <= cursor"""
+        result = await session.execute(delete(StatusEvent).where(StatusEvent.id <= cursor))
+        await session.commit()
+        return result.rowcount
+
+
+async def publish_status(session, rows: list[dict]):
+    """
+    Записывает смену роли в таблицу status (для совместимости) и в ленту status_events.
+    В status одна строка на пользователя (id — Telegram ID) с последней ролью,
+    поэтому повторная смена роли обновляет её, а не вставляет дубликат.
+    Коммит — за вызывающим; после него нужно вызвать status_feed.notify().
+    """
+    if session.bind.dialect.name == "sqlite":
+        status_stmt = sqlite_insert(Status).values(rows)
+        status_stmt = status_stmt.on_conflict_do_update(
+            index_elements=[Status.id],
+            set_={c: status_stmt.excluded[c] for c in ("language_code", "role", "text")}
+        )
+    else:
+        status_stmt = mysql_insert(Status).values(rows)
+        status_stmt = status_stmt.on_duplicate_key_update(
+            {c: status_stmt.inserted[c] for c in ("language_code", "role", "text")}
+        )
+    await session.execute(status_stmt)
+    await session.execute(insert(StatusEvent), [
+        {
+            "user_id": row["id"],
+            "language_code": row["language_code"],
+            "role": row["role"],
+            "text": row["text"]
+        }
+        for row in rows
+    ])
+
+
+async def create_status_events_table():
+    async with engine.begin() as conn:
+        await conn.run_sync(StatusEvent.__table__.create, checkfirst=True)
+
+
+status_feed = StatusFeed(poll_interval=STATUS_FEED_POLL_INTERVAL)
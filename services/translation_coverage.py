@@ -0,0 +1,84 @@
+import asyncio
+
+from sqlalchemy import select
+
+from models import SessionLocal, Translation
+from utils.logger import logger
+from utils.query_budget import uncounted
+
+
+class TranslationCoverage:
+    """
+    Индекс покрытия переводов, хранящийся в памяти процесса.
+
+    Для каждого языка — словарь key -> заполнен ли текст. Загружается из таблицы
+    translations один раз и дальше поддерживается обработчиками записи
+    (/update, /translations/save, /translate_with_gpt), поэтому страницам
+    настроек и переводов больше не нужно сканировать таблицу ради проверки покрытия.
+    """
+
+    def __init__(self, base_lang: str = "ru"):
+        self.base_lang = base_lang
+        self.langs: dict[str, dict[str, bool]] = {}
+        self.loaded = False
+        self.lock = asyncio.Lock()
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+        async with self.lock:
+            if self.loaded:
+                return
+            # Всегда с основной базы: после invalidate() по версии домена реплика
+            # может ещё не содержать записи другого воркера, а индекс не перечитается
+            # до следующей записи переводов
+            with uncounted():
+                async with SessionLocal() as session:
+                    result = await session.execute(
+                        select(Translation.key, Translation.lang, Translation.text)
+                    )
+                    rows = result.all()
+            langs = {}
+            for key, lang, text in rows:
+                langs.setdefault(lang, {})[key] = bool(text and text.strip())
+            self.langs = langs
+            self.loaded = True
+            logger.info(f"[COVERAGE] Индекс покрытия загружен: языков={len(langs)}")
+
+    def invalidate(self):
+        self.loaded = False
+
+    def put(self, key: str, lang: str, text: str):
+        """Запись существующего перевода (UPDATE)."""
+        self.langs.setdefault(lang, {})[key] = bool(text and text.strip())
+
+    def add(self, key: str, lang: str, text: str):
+        """Запись через INSERT IGNORE: существующее значение не меняется."""
+        keys = self.langs.setdefault(lang, {})
+        if key not in keys:
+            keys[key] = bool(text and text.strip())
+
+    def has_language(self, lang: str) -> bool:
+        return bool(self.langs.get(lang))
+
+    def used_languages(self) -> set[str]:
+        return {lang for lang, keys in self.langs.items() if keys}
+
+    def stats(self, lang: str) -> dict:
+        keys = self.langs.get(lang, {})
+        base = self.langs.get(self.base_lang, {})
+        missing = sorted(k for k in base if k not in keys)
+        empty = sorted(k for k, filled in keys.items() if not filled)
+        return {
+            "total": len(keys),
+            "base_total": len(base),
+            "missing": missing,
+            "empty": empty,
+            "percent": round(100 * (len(base) - len(missing)) / len(base)) if base else 0,
+        }
+
+    def summary(self) -> dict[str, dict]:
+        return {lang: self.stats(lang) for lang in self.used_languages()}
+
+
+coverage = TranslationCoverage()
@@ -0,0 +1,267 @@
+import asyncio
+import csv
+import io
+import re
+from itertools import islice
+from xml.etree.ElementTree import iterparse
+
+from sqlalchemy import select, insert, update, bindparam
+
+from config import IMPORT_BATCH_SIZE, IMPORT_REPORT_LIMIT
+from models import Translation
+from services.translation_text import protect, tokens
+from utils.reference import key_descriptions
+
+# Разбор файлов переводчиков. Каждый парсер читает файл потоково и выдаёт
+# записи (позиция, ключ, язык или None, текст); позиция — строка файла
+# (CSV, PO) или номер единицы перевода (XLIFF).
+
+FORMATS = {".csv": "csv", ".xlf": "xliff", ".xliff": "xliff", ".po": "po"}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename: str, requested: str = "") -> str:
+    if requested:
+        if requested not in FORMATS.values():
+            raise ImportFormatError(f"Неизвестный формат: {requested}")
+        return requested
+    ext = "." + (filename or "").rsplit(".", 1)[-1].lower()
+    if ext not in FORMATS:
+        raise ImportFormatError("Поддерживаются файлы .csv, .xlf/.xliff и .po")
+    return FORMATS[ext]
+
+
+def iter_csv(binary):
+    """
+    Длинный формат: колонки key, lang, text.
+    Широкий формат: key и по колонке на язык (колонка description пропускается).
+    """
+    reader = csv.reader(io.TextIOWrapper(binary, encoding="utf-8-sig", newline=""))
+    header = [h.strip().lower() for h in next(reader, [])]
+    if "key" not in header:
+        raise ImportFormatError("CSV: нет колонки key")
+    key_i = header.index("key")
+
+    if "lang" in header and "text" in header:
+        lang_i, text_i = header.index("lang"), header.index("text")
+        for row in reader:
+            if len(row) > max(key_i, lang_i, text_i):
+                yield reader.line_num, row[key_i].strip(), row[lang_i].strip(), row[text_i]
+        return
+
+    lang_cols = [(i, h) for i, h in enumerate(header) if i != key_i and h and h != "description"]
+    for row in reader:
+        if len(row) <= key_i:
+            continue
+        for i, lang in lang_cols:
+            if i < len(row):
+                yield reader.line_num, row[key_i].strip(), lang, row[i]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_xliff(binary):
+    """XLIFF 1.2 (file/trans-unit) и 2.0 (unit/segment); ключ — id единицы"""
+    lang = None
+    position = 0
+    for event, elem in iterparse(binary, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            if tag == "file" and elem.get("target-language"):
+                lang = elem.get("target-language")
+            elif tag == "xliff" and elem.get("trgLang"):
+                lang = elem.get("trgLang")
+            continue
+        if tag not in ("trans-unit", "unit"):
+            continue
+        position += 1
+        target = next((e for e in elem.iter() if _local(e.tag) == "target"), None)
+        if target is not None:
+            yield position, elem.get("resname") or elem.get("id") or "", \
+                (lang or "").split("-")[0].lower() or None, "".join(target.itertext())
+        elem.clear()
+
+
+_PO_ESCAPE_RE = re.compile(r"\\(.)")
+_PO_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+
+def _po_string(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    return _PO_ESCAPE_RE.sub(lambda m: _PO_ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def iter_po(binary):
+    """
+    gettext PO: ключ — msgctxt, а без него msgid; язык — из заголовка Language.
+    Неточные (fuzzy) и множественные (msgid_plural) записи пропускаются.
+    """
+    lang = None
+    entry, field, fuzzy, start = {}, None, False, 0
+
+    def finish():
+        nonlocal lang
+        if "msgid" not in entry:
+            return None
+        if entry["msgid"] == "" and "msgctxt" not in entry:
+            header = re.search(r"^Language:\s*([\w-]+)", entry.get("msgstr", ""), re.MULTILINE)
+            if header:
+                lang = header.group(1).split("_")[0].split("-")[0].lower()
+            return None
+        if fuzzy or "msgid_plural" in entry:
+            return None
+        return start, entry.get("msgctxt") or entry["msgid"], lang, entry.get("msgstr", "")
+
+    for number, raw in enumerate(io.TextIOWrapper(binary, encoding="utf-8"), 1):
+        line = raw.strip()
+        keyword = line.split(" ", 1)[0]
+        # Пустая строка, комментарий или новый msgid/msgctxt завершают предыдущую запись
+        if "msgstr" in entry and (not line or line.startswith("#") or keyword in ("msgctxt", "msgid")):
+            item = finish()
+            if item:
+                yield item
+            entry, field, fuzzy = {}, None, False
+        if not line:
+            continue
+        if line.startswith("#,"):
+            fuzzy = "fuzzy" in line
+        elif line.startswith("#"):
+            continue
+        elif line.startswith('"') and field:
+            entry[field] += _po_string(line)
+        elif keyword in ("msgctxt", "msgid", "msgid_plural", "msgstr"):
+            if not entry:
+                start = number
+            field = keyword
+            entry[field] = _po_string(line[len(keyword):])
+        elif keyword.startswith("msgstr["):
+            entry.setdefault("msgstr", "")
+            field = None
+
+    item = finish()
+    if item:
+        yield item
+
+
+PARSERS = {"csv": iter_csv, "xliff": iter_xliff, "po": iter_po}
+
+
+def normalize(text: str) -> str:
+    """В базе переносы строк хранятся литералами \\n — как их сохраняет редактор на /translations"""
+    return text.strip().replace("\r\n", "\n").replace("\n", "\\n")
+
+
+async def import_translations(
+    session,
+    entries,
+    languages: set[str],
+    default_lang: str = "",
+    dry_run: bool = True,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> dict:
+    """
+    Сверяет записи файла с базой пачками по batch_size и (если не dry_run)
+    добавляет новые и обновляет изменённые переводы в транзакции сессии.
+    Возвращает отчёт: счётчики, изменения и ошибки (не более IMPORT_REPORT_LIMIT строк каждого).
+    Коммит и сброс кешей — на вызывающем коде (по списку report["written"]).
+    """
+    result = await session.execute(
+        select(Translation.key, Translation.text).where(Translation.lang == "ru")
+    )
+    catalog = {key: tokens(protect(text or "")) for key, text in result}
+
+    report = {
+        "dry_run": dry_run, "rows": 0, "new": 0, "changed": 0, "unchanged": 0,
+        "skipped": 0, "rejected": 0, "changes": [], "errors": [], "undescribed": [], "written": []
+    }
+    seen = set()
+    undescribed = set()
+
+    def reject(position, key, lang, reason):
+        report["rejected"] += 1
+        if len(report["errors"]) < IMPORT_REPORT_LIMIT:
+            report["errors"].append({"position": position, "key": key, "lang": lang, "reason": reason})
+
+    while True:
+        # Разбор очередной пачки — в потоке, чтобы не блокировать цикл событий
+        batch = await asyncio.to_thread(lambda: list(islice(entries, batch_size)))
+        if not batch:
+            break
+
+        valid = {}
+        for position, key, lang, text in batch:
+            report["rows"] += 1
+            lang = (lang or default_lang).lower()
+            text = normalize(text or "")
+            if not text:
+                report["skipped"] += 1
+                continue
+            if not lang or lang not in languages:
+                reject(position, key, lang, "unknown_language")
+            elif key not in catalog:
+                reject(position, key, lang, "unknown_key")
+            elif (key, lang) in seen:
+                reject(position, key, lang, "duplicate")
+            elif tokens(protect(text, lang)) != catalog[key]:
+                reject(position, key, lang, "placeholders")
+            else:
+                seen.add((key, lang))
+                valid[(key, lang)] = text
+                if key not in key_descriptions:
+                    undescribed.add(key)
+
+        if not valid:
+            continue
+
+        existing = await session.execute(
+            select(Translation.id, Translation.key, Translation.lang, Translation.text)
+            .where(
+                Translation.key.in_({key for key, _ in valid}),
+                Translation.lang.in_({lang for _, lang in valid})
+            )
+        )
+        current = {}
+        for row in existing:
+            current.setdefault((row.key, row.lang), row)
+
+        inserts, updates = [], []
+        for (key, lang), text in valid.items():
+            row = current.get((key, lang))
+            if row is None:
+                action = "new"
+                inserts.append({"key": key, "lang": lang, "text": text})
+            elif row.text != text:
+                action = "changed"
+                updates.append({"tid": row.id, "new_text": text})
+            else:
+                report["unchanged"] += 1
+                continue
+            report[action] += 1
+            report["written"].append((key, lang, text))
+            if len(report["changes"]) < IMPORT_REPORT_LIMIT:
+                report["changes"].append({
+                    "action": action, "key": key, "lang": lang,
+                    "old": row.text if row is not None else None, "new": text
+                })
+
+        if dry_run:
+            continue
+        if inserts:
+            await session.execute(insert(Translation), inserts)
+        if updates:
+            table = Translation.__table__
+            await session.execute(
+                update(table).where(table.c.id == bindparam("tid")).values(text=bindparam("new_text")),
+                updates
+            )
+
+    # Ключи есть в каталоге ru, но без описания в descriptions.json
+    report["undescribed"] = sorted(undescribed)[:IMPORT_REPORT_LIMIT]
+    return report
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+
+from config import TRANSLATION_PROVIDER
+from services.translation_text import protect, check_translations
+from utils.profiling import profiled_call
+
+
+class TranslationProvider(ABC):
+    """
+    Интерфейс провайдера автоперевода. На вход — строки, где флаг исходного
+    языка уже заменён на {flag}; на выход — сырой ответ {key: перевод},
+    который проверяется в translate().
+    """
+
+    name = ""
+
+    @abstractmethod
+    async def translate(
+        self,
+        protected: dict[str, str],
+        target_lang: str,
+        lang_name: str,
+        emoji: str
+    ) -> dict:
+        ...
+
+
+class OpenAIProvider(TranslationProvider):
+    name = "openai"
+
+    async def translate(self, protected, target_lang, lang_name, emoji):
+        from services.gpt_translate import translate_with_gpt
+        return await translate_with_gpt(protected, target_lang, lang_name, emoji)
+
+
+class StubProvider(TranslationProvider):
+    """Детерминированный перевод без сети: "[en] текст" с сохранёнными плейсхолдерами"""
+
+    name = "stub"
+
+    async def translate(self, protected, target_lang, lang_name, emoji):
+        return {key: f"[{target_lang}] {text}" for key, text in protected.items()}
+
+
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "stub": StubProvider,
+}
+
+_instances: dict[str, TranslationProvider] = {}
+
+def get_provider(name: str = None) -> TranslationProvider:
+    name = name or TRANSLATION_PROVIDER
+    if name not in _instances:
+        if name not in PROVIDERS:
+            raise RuntimeError(f"❌ Неизвестный провайдер перевода: {name}")
+        _instances[name] = PROVIDERS[name]()
+    return _instances[name]
+
+async def translate(
+    ru_translations: dict[str, str],
+    target_lang: str,
+    lang_name: str,
+    emoji: str
+) -> tuple[dict[str, str], list[str]]:
+    """
+    Переводит строки и проверяет результат.
+    Возвращает (переводы, ключи, отбракованные из-за потерянных флагов/плейсхолдеров).
+    """
+    protected = {key: protect(text) for key, text in ru_translations.items()}
+    provider = get_provider()
+    async with profiled_call(f"translate.{provider.name}"):
+        raw = await provider.translate(protected, target_lang, lang_name, emoji)
+    return check_translations(protected, raw, target_lang)
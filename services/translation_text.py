@@ -0,0 +1,51 @@
+import re
+from collections import Counter
+
+from utils.reference import flags
+
+# Один скомпилированный шаблон на все флаги и плейсхолдеры вида {flag}, {text}, {moderator}.
+# Длинные флаги идут первыми, чтобы составные эмодзи не разрезались.
+_flag_alternatives = "|".join(
+    re.escape(flag) for flag in sorted(set(flags.values()), key=len, reverse=True)
+)
+TOKEN_RE = re.compile(rf"\{{\w+\}}|{_flag_alternatives}")
+
+
+def protect(text: str, source_lang: str = "ru") -> str:
+    """Флаг исходного языка → {flag}; остальные флаги и плейсхолдеры остаются как есть"""
+    source_flag = flags.get(source_lang)
+    return TOKEN_RE.sub(lambda m: "{flag}" if m.group() == source_flag else m.group(), text)
+
+
+def restore(text: str, target_lang: str) -> str:
+    """{flag} → флаг целевого языка"""
+    return text.replace("{flag}", flags.get(target_lang, target_lang.upper()))
+
+
+def tokens(text: str) -> Counter:
+    return Counter(TOKEN_RE.findall(text))
+
+
+def check_translations(
+    protected: dict[str, str],
+    translated: dict,
+    target_lang: str
+) -> tuple[dict[str, str], list[str]]:
+    """
+    Сверяет ответ переводчика с исходными (защищёнными) строками.
+    Возвращает (готовые переводы с восстановленным флагом, ключи с ошибками):
+    ключ отбраковывается, если его нет в ответе, значение не строка/пустое
+    или потерян либо добавлен какой-то флаг или плейсхолдер.
+    """
+    result = {}
+    rejected = []
+    for key, source in protected.items():
+        text = translated.get(key)
+        if not isinstance(text, str) or not text.strip() or tokens(text) != tokens(source):
+            rejected.append(key)
+            continue
+        # В базе переносы хранятся как литералы \n — возвращаем их, если модель развернула
+        if "\n" not in source:
+            text = text.replace("\r\n", "\\n").replace("\n", "\\n")
+        result[key] = restore(text.strip(), target_lang)
+    return result, rejected
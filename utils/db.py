@@ -0,0 +1,111 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from config import REPLICA_MAX_LAG, REPLICA_CHECK_INTERVAL
+from models import engine, read_engine, SessionLocal, ReadSessionLocal
+from utils.logger import logger
+
+
+class ReplicaRouter:
+    """
+    Выбор базы для чтения: реплика, если она отвечает и отстаёт не больше max_lag,
+    иначе primary. Результат проверки кешируется на check_interval секунд.
+    """
+
+    def __init__(self, max_lag: float, check_interval: float, check_timeout: float = 2):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.ok = read_engine is not engine
+        self.lag = None
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def _replica_lag(self, conn):
+        """Отставание реплики в секундах (None — неизвестно или не применимо)"""
+        if conn.dialect.name != "mysql":
+            await conn.execute(text("SELECT 1"))
+            return None
+        try:
+            result = await conn.execute(text("SHOW REPLICA STATUS"))
+        except Exception:
+            # MySQL < 8.0.22
+            result = await conn.execute(text("SHOW SLAVE STATUS"))
+        row = result.mappings().first()
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        # NULL — репликация остановлена
+        return float("inf") if lag is None else float(lag)
+
+    async def _measure(self):
+        async with read_engine.connect() as conn:
+            return await self._replica_lag(conn)
+
+    async def _check(self):
+        try:
+            # Таймаут и на подключение: недоступный хост не должен держать lock
+            # (а с ним и все read_session()) дольше check_timeout
+            lag = await asyncio.wait_for(self._measure(), self.check_timeout)
+        except Exception as e:
+            if self.ok:
+                logger.warning(f"[REPLICA] ⚠ Реплика недоступна, чтение с primary: {e}")
+            return False, None
+
+        ok = lag is None or lag <= self.max_lag
+        if not ok and self.ok:
+            logger.warning(f"[REPLICA] ⚠ Отставание реплики {lag} сек > {self.max_lag}, чтение с primary")
+        elif ok and not self.ok:
+            logger.info("[REPLICA] ✅ Реплика снова используется для чтения")
+        return ok, lag
+
+    async def use_replica(self) -> bool:
+        if read_engine is engine:
+            return False
+        if time.monotonic() - self.checked_at < self.check_interval:
+            return self.ok
+        async with self.lock:
+            if time.monotonic() - self.checked_at >= self.check_interval:
+                self.ok, self.lag = await self._check()
+                self.checked_at = time.monotonic()
+        return self.ok
+
+
+replica_router = ReplicaRouter(REPLICA_MAX_LAG, REPLICA_CHECK_INTERVAL)
+
+
+@asynccontextmanager
+async def read_session():
+    """Сессия для GET-страниц и статистики; изменения — только через SessionLocal"""
+    factory = ReadSessionLocal if await replica_router.use_replica() else SessionLocal
+    async with factory() as session:
+        yield session
+
+
+async def warm_pool(async_engine, connections: int):
+    """Открывает connections соединений заранее; после закрытия они остаются в пуле"""
+    async def open_one():
+        conn = await async_engine.connect()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    conns = await asyncio.gather(*(open_one() for _ in range(connections)))
+    for conn in conns:
+        await conn.close()
+
+
+async def ping(async_engine, timeout: float = 2) -> bool:
+    """База отвечает на SELECT 1 за timeout секунд"""
+    async def select_one():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(select_one(), timeout)
+        return True
+    except Exception as e:
+        logger.warning(f"[DB] ⚠ База недоступна: {e}")
+        return False
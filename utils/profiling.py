@@ -0,0 +1,144 @@
+import cProfile
+import io
+import itertools
+import pstats
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from jinja2 import Template
+from sqlalchemy import event
+
+from config import PROFILE_SAMPLE_RATE, PROFILE_KEEP
+from utils.logger import logger
+
+current_profile: ContextVar = ContextVar("current_profile", default=None)
+
+_ids = itertools.count(1)
+
+
+class RequestProfile:
+    """Профиль одного запроса: SQL, шаблоны, внешние вызовы и cProfile обработчика"""
+
+    def __init__(self, method: str, path: str, reason: str):
+        self.id = next(_ids)
+        self.method = method
+        self.path = path
+        self.reason = reason                  # "admin" — запрошен явно, "sample" — выборка
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.status_code = None
+        self.queries: list[tuple[str, float]] = []
+        self.templates: list[tuple[str, float]] = []
+        self.external: list[tuple[str, float]] = []
+        self.stats = ""
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(ms for _, ms in self.queries)
+
+    @property
+    def template_ms(self) -> float:
+        return sum(ms for _, ms in self.templates)
+
+    @property
+    def external_ms(self) -> float:
+        return sum(ms for _, ms in self.external)
+
+    def finish(self, status_code, profiler: cProfile.Profile = None, top: int = 40):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        self.status_code = status_code
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            self.stats = out.getvalue()
+
+
+class ProfileStore:
+    """Последние N профилей процесса"""
+
+    def __init__(self, keep: int):
+        self.items = deque(maxlen=keep)
+        # cProfile — один на поток: параллельные профилируемые запросы
+        # собирают только SQL/шаблоны/внешние вызовы
+        self.cprofile_busy = False
+
+    def add(self, profile: RequestProfile):
+        self.items.appendleft(profile)
+        logger.info(
+            f"[PROFILE] #{profile.id} {profile.method} {profile.path}: {profile.total_ms:.1f} мс, "
+            f"SQL {len(profile.queries)} за {profile.sql_ms:.1f} мс"
+        )
+
+    def get(self, profile_id: int):
+        return next((p for p in self.items if p.id == profile_id), None)
+
+
+profile_store = ProfileStore(PROFILE_KEEP)
+
+
+def requested(request) -> bool:
+    return request.headers.get("X-Profile") == "1" or request.query_params.get("profile") == "1"
+
+
+def sampled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@asynccontextmanager
+async def profiled_call(name: str):
+    """Замер внешнего вызова (Telegram, OpenAI) в текущем профиле"""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.external.append((name, (time.perf_counter() - started) * 1000))
+
+
+class ProfiledTemplate(Template):
+    """Шаблон Jinja, который записывает время рендеринга в текущий профиль"""
+
+    def render(self, *args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return super().render(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            profile.templates.append((self.name, (time.perf_counter() - started) * 1000))
+
+
+def instrument_templates(templates):
+    templates.env.template_class = ProfiledTemplate
+
+
+def instrument_engine(async_engine):
+    sync_engine = async_engine.sync_engine
+    if getattr(sync_engine, "_profiling_instrumented", False):
+        return
+    sync_engine._profiling_instrumented = True
+
+    # Время замеряется только для профилируемых запросов; начало хранится
+    # в контексте выполнения, остальные запросы обходятся одной проверкой
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and current_profile.get() is not None:
+            context._profile_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_profile_started", None)
+        if started is None:
+            return
+        profile = current_profile.get()
+        if profile is not None:
+            profile.queries.append((statement, (time.perf_counter() - started) * 1000))
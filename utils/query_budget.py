@@ -0,0 +1,111 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from config import QUERY_BUDGET_MODE, QUERY_BUDGET_DEFAULT, QUERY_REPEAT_LIMIT
+from utils.logger import logger
+
+current_counter: ContextVar = ContextVar("current_query_counter", default=None)
+
+_SHAPE_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                            # строковые литералы
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                         # числа
+    (re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)"), "(?)"),  # IN (?, ?, ...)
+    (re.compile(r"\s+"), " "),
+]
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    """SQL без значений: запросы, отличающиеся только параметрами, имеют одну форму"""
+    for pattern, repl in _SHAPE_RULES:
+        statement = pattern.sub(repl, statement)
+    return statement.strip()
+
+
+class QueryCounter:
+    """Счётчик SQL-запросов одного HTTP-запроса"""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes: Counter = Counter()
+
+    def add(self, statement: str):
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, limit: int = QUERY_REPEAT_LIMIT) -> list[tuple[str, int]]:
+        """Формы запросов, повторившиеся limit и более раз (признак N+1)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= limit]
+
+    @property
+    def max_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+
+@contextmanager
+def uncounted():
+    """Запросы внутри блока не входят в бюджет маршрута (заполнение кешей процесса)"""
+    token = current_counter.set(None)
+    try:
+        yield
+    finally:
+        current_counter.reset(token)
+
+
+def query_budget(limit: int | None, repeat_limit: int = None):
+    """
+    Объявляет максимум SQL-запросов для маршрута: @query_budget(4) под @app.get(...).
+    limit=None — без ограничения числа (оно растёт с размером входных данных).
+    repeat_limit заменяет QUERY_REPEAT_LIMIT для маршрута (0 — не проверять повторы,
+    например для пакетной обработки).
+    """
+    def decorator(func):
+        func.query_budget = limit
+        if repeat_limit is not None:
+            func.query_repeat_limit = repeat_limit
+        return func
+    return decorator
+
+
+def route_budget(scope) -> int | None:
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "query_budget", QUERY_BUDGET_DEFAULT)
+
+
+def check_budget(counter: QueryCounter, scope, method: str, path: str):
+    """Предупреждение в лог или (QUERY_BUDGET_MODE=strict) исключение при нарушении бюджета"""
+    if QUERY_BUDGET_MODE == "off":
+        return
+    problems = []
+    budget = route_budget(scope)
+    if budget is not None and counter.count > budget:
+        problems.append(f"{counter.count} запросов при бюджете {budget}")
+    repeat_limit = getattr(scope.get("endpoint"), "query_repeat_limit", QUERY_REPEAT_LIMIT)
+    for shape, n in (counter.repeated(repeat_limit) if repeat_limit else []):
+        problems.append(f"{n}× одинаковый запрос (N+1?): {shape[:200]}")
+    if not problems:
+        return
+    message = f"[QUERIES] {method} {path}: " + "; ".join(problems)
+    if QUERY_BUDGET_MODE == "strict":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def track_queries(async_engine):
+    sync_engine = async_engine.sync_engine
+    if getattr(sync_engine, "_query_budget_tracked", False):
+        return
+    sync_engine._query_budget_tracked = True
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter = current_counter.get()
+        if counter is not None:
+            counter.add(statement)
@@ -0,0 +1,15 @@
+import json
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def load_json(path: str):
+    """Справочные JSON-файлы читаются один раз на процесс"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Описания ключей переводов
+key_descriptions = load_json("descriptions.json")
+flags = load_json("flags.json")
+status_labels = load_json("status_labels.json")